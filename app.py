@@ -1,60 +1,169 @@
-from flask import Flask, render_template, redirect, url_for, request
+from startup import StartupTimer, enable_bytecode_cache, precompile_templates
+
+startup = StartupTimer()
+
+from flask import Flask, render_template, redirect, url_for, request, session, g, jsonify, abort
+from flask import before_render_template, template_rendered
+from markupsafe import Markup
+import functools
+import hashlib
+import heapq
+import itertools
+import os
 import random
-import copy
+import time
+
+from risk_tables import OUTCOMES, RiskTables
+from crew_search import suggest_crew
+from game_session import SessionStore, StateConflict, writable
+from mission_history import MissionHistory
+from campaign_stats import CampaignStats
+from roster import Roster
+from state_model import MissionRecord, WarMachine
+from rules import DEFAULT_RULES_PATH, load_rules
+from state_cache import StateCache
+from events import EventBroker
+from planner import CampaignPlanner
+from metrics import Metrics
+
+startup.mark("imports")
 
 app = Flask(__name__)
+app.secret_key = os.environ.get("GENESIS_SECRET_KEY") or os.urandom(32)
 
 # -------------------------------------------------
-# NO-CACHE HEADERS
+# METRICS
 # -------------------------------------------------
+# Opt-in with GENESIS_METRICS=1. Request latency is split into template
+# render time and everything else (handler time); game counters and gauges are
+# fed from state changes. Loading/compiling a template happens before the
+# render signal fires, so it counts as handler time (first use only). With
+# metrics off every hook returns immediately.
+metrics = Metrics() if os.environ.get("GENESIS_METRICS") == "1" else None
+
+if metrics is not None:
+    REQUEST_SECONDS = metrics.histogram(
+        "request_seconds", "Request latency in seconds by endpoint and phase (handler or render)."
+    )
+    MISSIONS_TOTAL = metrics.counter("missions_total", "Missions resolved by mode and outcome.")
+    DAYS_TOTAL = metrics.counter("days_advanced_total", "Days advanced by mode.")
+    HEAT_GAUGE = metrics.gauge("heat", "Global heat of the most recently changed state, by mode.")
+    INTEGRITY_GAUGE = metrics.gauge(
+        "war_machine_integrity", "War machine integrity of the most recently changed state, by mode."
+    )
+
+    @before_render_template.connect_via(app)
+    def start_render_timer(sender, template, context, **extra):
+        g.render_started = time.perf_counter()
+
+    @template_rendered.connect_via(app)
+    def stop_render_timer(sender, template, context, **extra):
+        started = g.pop("render_started", None)
+        if started is not None:
+            g.render_seconds = g.get("render_seconds", 0.0) + time.perf_counter() - started
+
+
+@app.before_request
+def start_request_timer():
+    if metrics is not None:
+        g.request_started = time.perf_counter()
+
+
 @app.after_request
-def add_no_cache_headers(response):
-    response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
-    response.headers["Pragma"] = "no-cache"
-    response.headers["Expires"] = "0"
+def record_request_timing(response):
+    # Registered before every other after_request hook (Flask runs them in
+    # reverse), so it runs last and the latency includes their work
+    started = g.get("request_started")
+    if metrics is None or started is None:
+        return response
+    endpoint = request.endpoint or "unknown"
+    render = g.get("render_seconds", 0.0)
+    total = time.perf_counter() - started
+    metrics.observe(REQUEST_SECONDS, (("endpoint", endpoint), ("phase", "handler")), total - render)
+    if render:
+        metrics.observe(REQUEST_SECONDS, (("endpoint", endpoint), ("phase", "render")), render)
+    return response
+
+
+def record_state_metrics(mode: str, before: dict, after: dict, state: dict) -> None:
+    labels = (("mode", mode),)
+    days = after["day"] - before["day"]
+    if days > 0:
+        metrics.inc(DAYS_TOTAL, labels, days)
+    new_rows = after["history_total"] - before["history_total"]
+    if new_rows > 0:
+        for record in state["mission_history"].latest(new_rows):
+            metrics.inc(MISSIONS_TOTAL, labels + (("outcome", record["outcome"]),))
+    metrics.set(HEAT_GAUGE, labels, after["global_heat"])
+    metrics.set(INTEGRITY_GAUGE, labels, after["integrity"])
+
+# -------------------------------------------------
+# CACHE HEADERS
+# -------------------------------------------------
+# Read-only pages are tagged with the state version and revalidated; static
+# files are fingerprinted with a content hash and cached for a year. Anything
+# else (POSTs, redirects, JSON) stays no-store.
+STATIC_MAX_AGE = 365 * 24 * 3600
+VERSIONED_PAGES = {
+    "index", "mission_plan", "mission_result", "history",
+    "medical", "war_machine", "crew", "stats",
+}
+_static_hashes = {}
+
+
+def static_hash(filename: str):
+    if filename not in _static_hashes:
+        try:
+            with open(os.path.join(app.static_folder, filename), "rb") as f:
+                _static_hashes[filename] = hashlib.sha256(f.read()).hexdigest()[:12]
+        except OSError:
+            _static_hashes[filename] = None
+    return _static_hashes[filename]
+
+
+@app.url_defaults
+def fingerprint_static(endpoint, values):
+    if endpoint == "static" and "v" not in values:
+        digest = static_hash(values["filename"])
+        if digest:
+            values["v"] = digest
+
+
+@app.after_request
+def add_cache_headers(response):
+    etag = g.get("etag")
+    if request.endpoint == "static" and request.args.get("v"):
+        response.headers["Cache-Control"] = f"public, max-age={STATIC_MAX_AGE}, immutable"
+    elif etag:
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "private, no-cache"
+        response.vary.add("Cookie")
+    else:
+        response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
+        response.headers["Pragma"] = "no-cache"
+        response.headers["Expires"] = "0"
     return response
 
 # -----------------------------
 # MISSION CONFIG (PHASE B)
 # -----------------------------
-MISSION_TYPES = {
-    "tech": {
-        "label": "Tech Operation",
-        "base_success": 0.8,
-        "base_heat": 5,
-        "wm_integrity_loss": 10,
-        "max_crew": 3,
-    },
-    "physical": {
-        "label": "Physical Operation",
-        "base_success": 0.65,
-        "base_heat": 12,
-        "wm_integrity_loss": 20,
-        "max_crew": 4,
-    },
-    # Shadow kept simple for now; we will gate visibility later
-    "shadow": {
-        "label": "Shadow Operation",
-        "base_success": 0.6,
-        "base_heat": -5,
-        "wm_integrity_loss": 5,
-        "max_crew": 2,
-    },
-}
+# Mission types, specialties and heat tiers live in rules.json and are
+# compiled into lookup tables at startup
+RULES = load_rules(os.environ.get("GENESIS_RULES", DEFAULT_RULES_PATH))
+MISSION_TYPES = RULES.mission_types
 
 # -----------------------------
 # BASE GAME STATE
 # -----------------------------
+HISTORY_RETENTION = int(os.environ.get("GENESIS_HISTORY_RETENTION", "5000"))
+
 BASE_GAME_STATE = {
+    "version": 0,
     "day": 1,
     "credits": 1000,
     "global_heat": 0,
-    "war_machine": {
-        "integrity": 100,
-        "repair_days": 0,
-        "upgrades": {},
-    },
-    "crew": [
+    "war_machine": WarMachine(integrity=100, repair_days=0, upgrades={}),
+    "crew": Roster([
         {
             "name": "Vega",
             "injury": None,
@@ -99,8 +208,9 @@ BASE_GAME_STATE = {
             "status": "Active",
             "known_shadow": [],
         },
-    ],
-    "mission_history": [],
+    ], specialty_bits=RULES.specialty_bits),
+    "mission_history": MissionHistory(retention=HISTORY_RETENTION),
+    "stats": CampaignStats(),
     "last_mission_result": None,
     "last_mission_config": {
         "mission_type": "tech",
@@ -111,44 +221,221 @@ BASE_GAME_STATE = {
     },
 }
 
-sandbox_state = copy.deepcopy(BASE_GAME_STATE)
-game_state = copy.deepcopy(BASE_GAME_STATE)
+# -----------------------------
+# PER-SESSION STATE
+# -----------------------------
+# GENESIS_STATE_DB=path keeps sessions in a shared SQLite database instead of
+# process memory, so several worker processes can serve the same sessions.
+# They must also share the cookie signing key: without GENESIS_SECRET_KEY one
+# is generated once and kept next to the database.
+STATE_DB = os.environ.get("GENESIS_STATE_DB")
+if STATE_DB:
+    from sqlite_store import SqliteSessionStore, shared_secret_key
+
+    if not os.environ.get("GENESIS_SECRET_KEY"):
+        app.secret_key = shared_secret_key(STATE_DB)
+
+    sessions = SqliteSessionStore(
+        STATE_DB, BASE_GAME_STATE, on_load=lambda state: assign_version(state)
+    )
+else:
+    sessions = SessionStore(BASE_GAME_STATE)
+MAX_SAVE_RETRIES = 5
+
+
+@app.before_request
+def load_session_state():
+    if request.endpoint == "static":
+        return
+    session_id = session.get("sid")
+    if session_id is None and request.method in ("GET", "HEAD"):
+        # Nothing to keep yet: bots, health checks and first page views read
+        # the starting state without creating (and later evicting) a session
+        g.game = sessions.transient()
+    else:
+        if session_id is None:
+            session_id = session["sid"] = SessionStore.new_id()
+        g.game = sessions.get(session_id)
+    # Hold the session lock for the whole request so each one sees and leaves
+    # a consistent state under a threaded server
+    g.game.lock.acquire()
+    if session_id is not None:
+        sessions.refresh(g.game)
+
+
+@app.teardown_request
+def release_session_state(exc=None):
+    game = g.pop("game", None)
+    if game is not None:
+        game.lock.release()
+
+
+def saving_session(view):
+    """Save the session after a POST; on a conflict with another worker,
+    reload it and run the view again."""
+    @functools.wraps(view)
+    def wrapper(**kwargs):
+        for _ in range(MAX_SAVE_RETRIES):
+            response = view(**kwargs)
+            if request.method != "POST":
+                return response
+            try:
+                sessions.save(g.game)
+                return response
+            except StateConflict:
+                sessions.reload(g.game)
+        abort(409)
+    return wrapper
+
+
+def campaign_state() -> dict:
+    return g.game.states["campaign"]
+
+
+def sandbox_state() -> dict:
+    return g.game.states["sandbox"]
+
+# -----------------------------
+# STATE VERSIONS
+# -----------------------------
+# One process-wide counter, so a version number is never reused by another
+# state (e.g. a freshly forked sandbox); BOOT_ID keeps ETags from a previous
+# process from matching.
+BOOT_ID = os.urandom(4).hex()
+_versions = itertools.count(1)
+
+# Derived values keyed on state version: mission plan previews and rendered
+# page fragments. Mutations drop the old version's entries.
+preview_cache = StateCache("preview")
+fragment_cache = StateCache("fragment")
+
+
+def assign_version(state: dict) -> None:
+    state["version"] = next(_versions)
+
+
+def bump_version(state: dict) -> None:
+    old_version = state["version"]
+    assign_version(state)
+    # Version 0 is the untouched base state that every new session shares
+    if old_version:
+        preview_cache.invalidate_version(old_version)
+        fragment_cache.invalidate_version(old_version)
+
+
+def endpoint_mode():
+    """('campaign' | 'sandbox', page) for a mode route, else (None, None)."""
+    mode, _, page = (request.endpoint or "").partition("_")
+    if mode not in ("campaign", "sandbox"):
+        return None, None
+    return mode, page
+
+
+@app.before_request
+def check_state_version():
+    if request.method != "GET":
+        return None
+    mode, page = endpoint_mode()
+    if page not in VERSIONED_PAGES:
+        return None
+    g.etag = f"{BOOT_ID}-{mode}-{g.game.states[mode]['version']}"
+    if g.etag in request.if_none_match:
+        # Client already has this exact state; skip the handler and render
+        return app.response_class(status=304)
+    return None
+
+# -----------------------------
+# STATE-CHANGE EVENTS
+# -----------------------------
+# Mutating POSTs publish a compact delta to the session's open dashboards.
+# Nothing is computed unless someone is subscribed to that channel or
+# metrics are on. A stream never ends, so the event endpoints only exist
+# (and dashboards only open one) when LIVE_EVENTS is set (serve_async.py
+# does); under a sync or threaded server each open stream would hold a worker.
+app.config.setdefault("LIVE_EVENTS", False)
+broker = EventBroker()
+MAX_EVENT_HISTORY_ROWS = 20
+
+
+def state_summary(state: dict) -> dict:
+    return {
+        "version": state["version"],
+        "day": state["day"],
+        "global_heat": state["global_heat"],
+        "heat_tier": heat_tier(state["global_heat"]),
+        "integrity": state["war_machine"]["integrity"],
+        "injured": sorted(state["crew"].injured),
+        "history_total": state["mission_history"].total,
+    }
+
+
+@app.before_request
+def capture_state_before():
+    if request.method != "POST":
+        return
+    mode, _ = endpoint_mode()
+    if mode and (metrics is not None or broker.has_subscribers((g.game.session_id, mode))):
+        g.summary_before = (mode, state_summary(g.game.states[mode]))
+
+
+@app.after_request
+def publish_state_change(response):
+    captured = g.pop("summary_before", None)
+    if captured is None:
+        return response
+    mode, before = captured
+    state = g.game.states[mode]
+    after = state_summary(state)
+    if after["version"] == before["version"]:
+        return response
+    if metrics is not None:
+        record_state_metrics(mode, before, after, state)
+    channel = (g.game.session_id, mode)
+    if not broker.has_subscribers(channel):
+        return response
+    event = {"type": "delta", "mode": mode}
+    event.update((k, v) for k, v in after.items() if v != before.get(k))
+    new_rows = after["history_total"] - before["history_total"]
+    if new_rows > 0:
+        rows = state["mission_history"].latest(min(new_rows, MAX_EVENT_HISTORY_ROWS))
+        event["new_history"] = rows[::-1]
+    broker.publish(channel, event)
+    return response
+
+
+def event_stream_response(mode: str):
+    if not app.config["LIVE_EVENTS"]:
+        abort(404)
+    # The stream outlives this request, so it must not touch g or the
+    # session lock; everything it needs is captured here.
+    state = g.game.states[mode]
+    return app.response_class(
+        broker.stream(
+            (g.game.session_id, mode),
+            lambda: {"type": "snapshot", "mode": mode, **state_summary(state)},
+        ),
+        mimetype="text/event-stream",
+        headers={"X-Accel-Buffering": "no"},
+    )
 
 # -----------------------------
 # HEAT / RISK / ADVISOR
 # -----------------------------
+HEAT_TIER_FLOORS = RULES.heat_tier_floors
+INJURY_CHANCE_BY_TIER = RULES.injury_chance_by_tier
+ADVISOR_BY_TIER = RULES.advisor_by_tier
+
+
 def heat_tier(heat: int) -> str:
-    if heat < 10:
-        return "Cold"
-    if heat < 25:
-        return "Warm"
-    if heat < 45:
-        return "Hot"
-    if heat < 70:
-        return "Severe"
-    return "Critical"
+    return RULES.heat_tier(heat)
 
 
 def injury_chance_by_heat(heat: int) -> int:
-    table = {
-        "Cold": 5,
-        "Warm": 10,
-        "Hot": 20,
-        "Severe": 35,
-        "Critical": 55,
-    }
-    return table[heat_tier(heat)]
+    return INJURY_CHANCE_BY_TIER[heat_tier(heat)]
 
 
 def advisor_for_heat(heat: int) -> dict:
-    table = {
-        "Cold": {"severity": "calm", "message": "Heat is low. Operations are safe."},
-        "Warm": {"severity": "notice", "message": "Minor attention detected."},
-        "Hot": {"severity": "warning", "message": "Heat is rising. Expect resistance."},
-        "Severe": {"severity": "urgent", "message": "High risk. Injuries likely."},
-        "Critical": {"severity": "critical", "message": "Exposure critical. Stand down."},
-    }
-    return table[heat_tier(heat)]
+    return ADVISOR_BY_TIER[heat_tier(heat)]
 
 
 def risk_for_heat(heat: int) -> dict:
@@ -160,7 +447,18 @@ def risk_for_heat(heat: int) -> dict:
 # -----------------------------
 # NAVIGATION
 # -----------------------------
+_nav_cache = {}
+
+
 def nav_for(mode: str) -> dict:
+    key = (mode, request.script_root)
+    nav = _nav_cache.get(key)
+    if nav is None:
+        nav = _nav_cache[key] = _build_nav(mode)
+    return nav
+
+
+def _build_nav(mode: str) -> dict:
     base = "sandbox_" if mode == "sandbox" else "campaign_"
     return {
         "command": url_for(f"{base}index"),
@@ -169,6 +467,8 @@ def nav_for(mode: str) -> dict:
         "medical": url_for(f"{base}medical"),
         "war_machine": url_for(f"{base}war_machine"),
         "crew": url_for(f"{base}crew"),
+        "stats": url_for(f"{base}stats"),
+        "events": url_for(f"{base}events"),
         "toggle": url_for("toggle_mode"),
     }
 
@@ -177,29 +477,11 @@ def nav_for(mode: str) -> dict:
 # -----------------------------
 def compute_mission_preview(state: dict, mission_type: str, selected_crew_names: list[str]) -> dict:
     mt = MISSION_TYPES[mission_type]
-    crew_objs = [c for c in state["crew"] if c["name"] in selected_crew_names]
-
-    base_success = mt["base_success"]
-    specialties = [c["specialty"] for c in crew_objs]
-
-    # Basic specialty bonuses / penalties
-    if mission_type == "tech":
-        if any("Tech" in s for s in specialties):
-            base_success += 0.05
-        else:
-            base_success -= 0.1
-    elif mission_type == "physical":
-        if any("Physical" in s for s in specialties):
-            base_success += 0.05
-        else:
-            base_success -= 0.1
-    elif mission_type == "shadow":
-        if any("Stealth" in s or "Shadow" in s for s in specialties):
-            base_success += 0.05
-        else:
-            base_success -= 0.1
-
-    base_success = max(0.2, min(0.95, base_success))
+    roster = state["crew"]
+    crew_objs = roster.select(selected_crew_names)
+
+    # Specialty bonus / penalty and clamping are precompiled per crew mask
+    projected_success = RULES.success_by_mask[mission_type][roster.mask_of(selected_crew_names)]
 
     crew_heat = sum(c.get("heat_mod", 0) for c in crew_objs)
     heat_change = mt["base_heat"] + crew_heat
@@ -207,40 +489,238 @@ def compute_mission_preview(state: dict, mission_type: str, selected_crew_names:
     wm_change = -mt["wm_integrity_loss"]
 
     return {
-        "projected_success": round(base_success * 100),
+        "projected_success": projected_success,
         "projected_heat_change": heat_change,
         "projected_wm_change": wm_change,
     }
 
+def preview_crew_key(state: dict, names: list[str]) -> tuple:
+    # compute_mission_preview only sees the crew's specialty mask and heat mods
+    roster = state["crew"]
+    return roster.mask_of(names), sum(c.get("heat_mod", 0) for c in roster.select(names))
+
+
+risk_tables = RiskTables(
+    MISSION_TYPES,
+    compute_mission_preview,
+    injury_chance_by_heat,
+    injury_chances=INJURY_CHANCE_BY_TIER.values(),
+    crew_key_fn=preview_crew_key,
+)
+risk_tables.precompute(BASE_GAME_STATE)
+startup.mark("rules")
+
+
+def suggest_crew_for(state: dict, mission_type: str, top_k: int = 3) -> list[dict]:
+    masks = state["crew"].masks
+    wanted = RULES.mission_masks[mission_type]
+    return suggest_crew(
+        state["crew"],
+        MISSION_TYPES[mission_type],
+        lambda member: masks[member["name"]] & wanted,
+        (RULES.success_pct(mission_type, False), RULES.success_pct(mission_type, True)),
+        top_k=top_k,
+    )
+
+
+def exact_mission_risk(state: dict, mission_type: str, selected_crew_names: list[str], heat=None) -> dict:
+    return risk_tables.lookup(state, mission_type, selected_crew_names, heat)
+
+
+MAX_PREVIEW_PLANS = 100
+
+
+def preview_plans(state: dict, plans: list) -> dict:
+    """Evaluate a batch of candidate plans against one read of `state`.
+
+    Each plan is {"mission_type", "crew", optional "heat"}; a bad plan gets an
+    "error" entry instead of failing the whole batch.
+    """
+    results = []
+    for plan in plans:
+        if not isinstance(plan, dict):
+            results.append({"error": "each plan must be an object"})
+            continue
+        mission_type = plan.get("mission_type")
+        crew = plan.get("crew")
+        heat = plan.get("heat")
+        if mission_type not in MISSION_TYPES:
+            results.append({"error": f"unknown mission_type: {mission_type!r}"})
+            continue
+        if not crew or not isinstance(crew, list) or not all(isinstance(n, str) for n in crew):
+            results.append({"error": "crew must be a non-empty list of names"})
+            continue
+        max_crew = MISSION_TYPES[mission_type]["max_crew"]
+        if len(set(crew)) > max_crew:
+            results.append({"error": f"at most {max_crew} crew for {mission_type}"})
+            continue
+        # JSON true/false arrive as bool, which is an int subclass
+        if heat is not None and (isinstance(heat, bool) or not isinstance(heat, int) or heat < 0):
+            results.append({"error": "heat must be a non-negative integer"})
+            continue
+        results.append({
+            "mission_type": mission_type,
+            "crew": crew,
+            "heat": state["global_heat"] if heat is None else heat,
+            "preview": compute_mission_preview(state, mission_type, crew),
+            "risk": exact_mission_risk(state, mission_type, crew, heat),
+        })
+    return {
+        "day": state["day"],
+        "global_heat": state["global_heat"],
+        "results": results,
+    }
+
+
+def preview_plans_response(state: dict):
+    payload = request.get_json(silent=True)
+    plans = payload.get("plans") if isinstance(payload, dict) else None
+    if not isinstance(plans, list):
+        return jsonify({"error": "expected a JSON body with a 'plans' list"}), 400
+    if len(plans) > MAX_PREVIEW_PLANS:
+        return jsonify({"error": f"at most {MAX_PREVIEW_PLANS} plans per request"}), 400
+    return jsonify(preview_plans(state, plans))
+
+
+_simulator = None
+
+
+def mission_simulator():
+    """mission_sim.simulate_mission, imported on first use (NumPy is slow to
+    import); None when NumPy is not installed."""
+    global _simulator
+    if _simulator is None:
+        try:
+            from mission_sim import simulate_mission
+        except ImportError:  # NumPy is optional; previews fall back to the point estimate
+            simulate_mission = False
+        _simulator = simulate_mission
+    return _simulator or None
+
+
+def simulate_mission_preview(state: dict, mission_type: str, selected_crew_names: list[str]):
+    simulate_mission = mission_simulator()
+    if simulate_mission is None:
+        return None
+    preview = compute_mission_preview(state, mission_type, selected_crew_names)
+    eligible = [c for c in state["crew"].select(selected_crew_names) if c["injury"] is None]
+    return simulate_mission(
+        preview,
+        state["global_heat"],
+        state["war_machine"]["integrity"],
+        len(eligible),
+        injury_chance_by_heat,
+    )
+
+def mission_plan_bundle(state: dict, mission_type: str, selected_crew_names: list[str]) -> dict:
+    """Preview, simulation and exact odds for a plan, memoized per state version."""
+    return preview_cache.get_or_compute(
+        state["version"],
+        ("plan", mission_type, frozenset(selected_crew_names)),
+        lambda: {
+            "preview": compute_mission_preview(state, mission_type, selected_crew_names),
+            "simulation": simulate_mission_preview(state, mission_type, selected_crew_names),
+            "exact_risk": exact_mission_risk(state, mission_type, selected_crew_names),
+        },
+    )
+
+
+def cached_suggestions(state: dict, mission_type: str) -> list[dict]:
+    return preview_cache.get_or_compute(
+        state["version"],
+        ("suggest", mission_type),
+        lambda: suggest_crew_for(state, mission_type),
+    )
+
+
+def crew_cards(state: dict) -> Markup:
+    """Rendered crew card grid, shared by every crew page view of this version."""
+    return fragment_cache.get_or_compute(
+        state["version"],
+        "crew_cards.html",
+        lambda: Markup(render_template("crew_cards.html", crew=state["crew"], heat_tier=heat_tier)),
+    )
+
 # -----------------------------
 # CORE ACTIONS
 # -----------------------------
+RECOVERY_DAYS = 3
+
+
 def advance_day(state: dict) -> None:
-    state["day"] += 1
-    state["global_heat"] = max(0, state["global_heat"] - 1)
-    for member in state["crew"]:
-        if member["injury"] == "Injured":
-            member["injury_days"] = member.get("injury_days", 0) + 1
-            if member["injury_days"] >= 3:
-                member["injury"] = None
-                member["injury_days"] = 0
-        else:
-            member["injury_days"] = 0
-    # WM auto-repair hooks could go here later
-
-
-def resolve_mission(state: dict, mission_type: str, selected_crew_names: list[str]) -> None:
+    advance_days(state, 1)
+
+
+def advance_days(state: dict, days: int) -> None:
+    """Advance `days` days in one step, with the same result as `days` single days.
+
+    Each day heat decays by 1, injured crew recover after RECOVERY_DAYS and a
+    pending war machine repair counts down. Rather than stepping day by day,
+    the points where something changes (a recovery, a finished repair, heat
+    decaying into a lower tier) are queued by day offset and handled in order,
+    so a fast-forward costs O(events) instead of O(days x crew).
+    """
+    if days <= 0:
+        return
+    bump_version(state)
+    roster = writable(state, "crew")
+    heat = state["global_heat"]
+    repair_days = state["war_machine"]["repair_days"]
+
+    # (offset, order, kind, payload): offset k fires once k days have passed
+    events = []
+    for floor in HEAT_TIER_FLOORS:
+        offset = heat - floor + 1
+        if 0 < offset < days:
+            events.append((offset, 0, "tier", heat_tier(floor - 1)))
+    for member in roster.injured_members():
+        offset = max(1, RECOVERY_DAYS - member.get("injury_days", 0))
+        if offset <= days:
+            events.append((offset, 1, "recover", member["name"]))
+    if 0 < repair_days <= days:
+        events.append((repair_days, 2, "repair", None))
+    heapq.heapify(events)
+
+    stats = writable(state, "stats")
+    tier, tier_since = heat_tier(heat), 0
+    while events:
+        offset, _, kind, payload = heapq.heappop(events)
+        if kind == "tier":
+            stats.record_days(tier, offset - tier_since)
+            tier, tier_since = payload, offset
+        elif kind == "recover":
+            roster.heal(payload)
+        elif kind == "repair":
+            war_machine = writable(state, "war_machine")
+            war_machine["integrity"] = 100
+            war_machine["repair_days"] = 0
+    stats.record_days(tier, days - tier_since)
+
+    # Healthy members always have injury_days == 0; the rest just age
+    for member in roster.injured_members():
+        member["injury_days"] = member.get("injury_days", 0) + days
+    if repair_days > days:
+        writable(state, "war_machine")["repair_days"] = repair_days - days
+
+    state["day"] += days
+    state["global_heat"] = max(0, heat - days)
+
+
+def resolve_mission(state: dict, mission_type: str, selected_crew_names: list[str], rng=random) -> None:
     mt = MISSION_TYPES[mission_type]
     preview = compute_mission_preview(state, mission_type, selected_crew_names)
+    bump_version(state)
 
     state["global_heat"] = max(0, state["global_heat"] + preview["projected_heat_change"])
-    state["war_machine"]["integrity"] = max(
+    war_machine = writable(state, "war_machine")
+    integrity_before = war_machine["integrity"]
+    war_machine["integrity"] = max(
         0,
-        min(100, state["war_machine"]["integrity"] + preview["projected_wm_change"]),
+        min(100, war_machine["integrity"] + preview["projected_wm_change"]),
     )
 
     success_chance = preview["projected_success"] / 100.0
-    roll = random.random()
+    roll = rng.random()
 
     if roll < success_chance * 0.75:
         outcome = "Success"
@@ -251,28 +731,32 @@ def resolve_mission(state: dict, mission_type: str, selected_crew_names: list[st
 
     injuries = []
     chance = injury_chance_by_heat(state["global_heat"]) / 100.0
-    for member in state["crew"]:
-        if member["name"] in selected_crew_names and member["injury"] is None:
-            if random.random() < chance:
-                member["injury"] = "Injured"
-                member["injury_days"] = 0
+    roster = writable(state, "crew")
+    crew = roster.select(selected_crew_names)
+    for member in crew:
+        if member["injury"] is None:
+            if rng.random() < chance:
+                roster.injure(member["name"])
                 injuries.append(member["name"])
 
-    result = {
-        "day": state["day"],
-        "outcome": outcome,
-        "heat_after": state["global_heat"],
-        "wm_integrity_after": state["war_machine"]["integrity"],
-        "injuries": injuries,
-        "mission_type": mission_type,
-        "mission_label": mt["label"],
-        "crew": selected_crew_names,
-        "projected_success": preview["projected_success"],
-        "projected_heat_change": preview["projected_heat_change"],
-        "projected_wm_change": preview["projected_wm_change"],
-    }
+    result = MissionRecord(
+        day=state["day"],
+        outcome=outcome,
+        heat_after=state["global_heat"],
+        wm_integrity_after=state["war_machine"]["integrity"],
+        injuries=injuries,
+        mission_type=mission_type,
+        mission_label=mt["label"],
+        crew=selected_crew_names,
+        projected_success=preview["projected_success"],
+        projected_heat_change=preview["projected_heat_change"],
+        projected_wm_change=preview["projected_wm_change"],
+    )
 
-    state["mission_history"].append(result)
+    writable(state, "mission_history").append(result)
+    writable(state, "stats").record_mission(
+        result, integrity_before - war_machine["integrity"], crew
+    )
     state["last_mission_result"] = result
     state["last_mission_config"] = {
         "mission_type": mission_type,
@@ -282,6 +766,106 @@ def resolve_mission(state: dict, mission_type: str, selected_crew_names: list[st
         "projected_wm_integrity_change": preview["projected_wm_change"],
     }
 
+
+def lay_low(state: dict) -> None:
+    bump_version(state)
+    state["global_heat"] = max(0, state["global_heat"] - 3)
+
+
+def espionage(state: dict) -> None:
+    bump_version(state)
+    state["global_heat"] = max(0, state["global_heat"] - 6)
+
+
+def heal_crew(state: dict) -> None:
+    bump_version(state)
+    roster = writable(state, "crew")
+    for member in roster.injured_members():
+        roster.heal(member["name"])
+
+
+def repair_war_machine(state: dict) -> None:
+    bump_version(state)
+    writable(state, "war_machine")["integrity"] = 100
+
+# -----------------------------
+# PLANNER
+# -----------------------------
+MAX_PLAN_DAYS = 14
+DEFAULT_PLAN_DAYS = 5
+PLAN_BUDGET = 0.5  # seconds of search per plan request
+
+planner = CampaignPlanner(
+    MISSION_TYPES,
+    {
+        "mission": resolve_mission,
+        "lay_low": lay_low,
+        "espionage": espionage,
+        "heal": heal_crew,
+        "repair": repair_war_machine,
+        "wait": lambda state: None,
+        "advance_day": advance_day,
+    },
+    compute_mission_preview,
+    injury_chance_by_heat,
+    heat_tier,
+    RULES.tier_names,
+    RULES.max_tier_heat,
+    lambda state, mission_type: [s["crew"] for s in suggest_crew_for(state, mission_type, top_k=2)],
+    lambda members: Roster(members, specialty_bits=RULES.specialty_bits),
+)
+
+
+def plan_response(state: dict):
+    days = min(max(request.args.get("days", DEFAULT_PLAN_DAYS, type=int), 1), MAX_PLAN_DAYS)
+    max_tier = request.args.get("max_tier", RULES.tier_names[-1])
+    if max_tier not in RULES.tier_names:
+        return jsonify({"error": f"unknown heat tier: {max_tier!r}"}), 400
+    plan = preview_cache.get_or_compute(
+        state["version"],
+        ("plan", days, max_tier),
+        lambda: planner.plan(state, days, max_tier, PLAN_BUDGET),
+    )
+    return jsonify(plan)
+
+# -----------------------------
+# HISTORY FILTERS
+# -----------------------------
+# Filter values come straight from the query string; everything is answered
+# from MissionHistory's secondary indexes, so filtering a long campaign costs
+# about the same as paging it.
+HISTORY_FILTERS = ("crew", "mission_type", "outcome", "injured", "day_min", "day_max", "order")
+
+
+def history_response(state: dict, mode: str):
+    args = request.args
+    filters = {name: args[name] for name in HISTORY_FILTERS if args.get(name)}
+    equals = {name: filters[name] for name in ("crew", "mission_type", "outcome") if name in filters}
+    injured = filters.get("injured")
+    nonempty = {"injuries": injured == "yes"} if injured in ("yes", "no") else None
+    day_min = args.get("day_min", type=int)
+    day_max = args.get("day_max", type=int)
+    if day_min is not None and day_max is not None and day_min > day_max:
+        day_min, day_max = day_max, day_min
+    history = state["mission_history"].query(
+        equals,
+        nonempty,
+        day_min=day_min,
+        day_max=day_max,
+        newest_first=filters.get("order") != "oldest",
+        cursor=args.get("cursor", type=int),
+    )
+    return render_template(
+        "history.html",
+        history=history,
+        filters=filters,
+        crew_names=[m["name"] for m in state["crew"]],
+        mission_types=MISSION_TYPES,
+        outcomes=OUTCOMES,
+        nav=nav_for(mode),
+        mode=mode,
+    )
+
 # -----------------------------
 # MODE TOGGLE
 # -----------------------------
@@ -291,6 +875,22 @@ def toggle_mode():
         return redirect(url_for("campaign_index"))
     return redirect(url_for("sandbox_index"))
 
+@app.route("/metrics")
+def metrics_endpoint():
+    if metrics is None:
+        abort(404)
+    return app.response_class(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+
+@app.route("/api/startup")
+def startup_stats():
+    return jsonify(startup.report())
+
+
+@app.route("/api/cache_stats")
+def cache_stats():
+    return jsonify([preview_cache.stats(), fragment_cache.stats()])
+
 # -----------------------------
 # SANDBOX ROUTES
 # -----------------------------
@@ -299,12 +899,15 @@ def sandbox_index():
     if request.method == "POST":
         action = request.form.get("action")
         if action == "advance_day":
-            advance_day(sandbox_state)
+            advance_day(sandbox_state())
+            return redirect(url_for("sandbox_index"))
+        if action == "advance_days":
+            advance_days(sandbox_state(), request.form.get("days", 1, type=int))
             return redirect(url_for("sandbox_index"))
     return render_template(
         "index.html",
-        state=sandbox_state,
-        advisor=advisor_for_heat(sandbox_state["global_heat"]),
+        state=sandbox_state(),
+        advisor=advisor_for_heat(sandbox_state()["global_heat"]),
         nav=nav_for("sandbox"),
         mode="sandbox",
         heat_tier=heat_tier,
@@ -316,43 +919,59 @@ def sandbox_mission_plan():
     if request.method == "POST":
         mission_type = request.form.get("mission_type", "tech")
         selected_crew = request.form.getlist("crew")
-        preview = compute_mission_preview(sandbox_state, mission_type, selected_crew) if selected_crew else None
+        plan = mission_plan_bundle(sandbox_state(), mission_type, selected_crew) if selected_crew else {}
         return render_template(
             "mission_plan.html",
-            risk=risk_for_heat(sandbox_state["global_heat"]),
-            advisor=advisor_for_heat(sandbox_state["global_heat"]),
+            risk=risk_for_heat(sandbox_state()["global_heat"]),
+            advisor=advisor_for_heat(sandbox_state()["global_heat"]),
             nav=nav_for("sandbox"),
             mode="sandbox",
             heat_tier=heat_tier,
             mission_types=MISSION_TYPES,
-            crew=sandbox_state["crew"],
+            crew=sandbox_state()["crew"],
             selected_type=mission_type,
             selected_crew=selected_crew,
-            preview=preview,
+            preview=plan.get("preview"),
+            simulation=plan.get("simulation"),
+            exact_risk=plan.get("exact_risk"),
+            suggestions=cached_suggestions(sandbox_state(), mission_type),
         )
 
     return render_template(
         "mission_plan.html",
-        risk=risk_for_heat(sandbox_state["global_heat"]),
-        advisor=advisor_for_heat(sandbox_state["global_heat"]),
+        risk=risk_for_heat(sandbox_state()["global_heat"]),
+        advisor=advisor_for_heat(sandbox_state()["global_heat"]),
         nav=nav_for("sandbox"),
         mode="sandbox",
         heat_tier=heat_tier,
         mission_types=MISSION_TYPES,
-        crew=sandbox_state["crew"],
+        crew=sandbox_state()["crew"],
         selected_type="tech",
         selected_crew=[],
         preview=None,
+        simulation=None,
+        exact_risk=None,
+        suggestions=cached_suggestions(sandbox_state(), "tech"),
     )
 
 
+@app.route("/sandbox/api/preview", methods=["POST"])
+def sandbox_api_preview():
+    return preview_plans_response(sandbox_state())
+
+
+@app.route("/sandbox/api/plan")
+def sandbox_api_plan():
+    return plan_response(sandbox_state())
+
+
 @app.route("/sandbox/launch_mission", methods=["POST"])
 def sandbox_launch_mission():
     mission_type = request.form.get("mission_type", "tech")
     selected_crew = request.form.getlist("crew")
     if not selected_crew:
         return redirect(url_for("sandbox_mission_plan"))
-    resolve_mission(sandbox_state, mission_type, selected_crew)
+    resolve_mission(sandbox_state(), mission_type, selected_crew)
     return redirect(url_for("sandbox_mission_result"))
 
 
@@ -360,7 +979,7 @@ def sandbox_launch_mission():
 def sandbox_mission_result():
     return render_template(
         "mission_result.html",
-        result=sandbox_state["last_mission_result"],
+        result=sandbox_state()["last_mission_result"],
         nav=nav_for("sandbox"),
         mode="sandbox",
     )
@@ -368,23 +987,15 @@ def sandbox_mission_result():
 
 @app.route("/sandbox/history")
 def sandbox_history():
-    return render_template(
-        "history.html",
-        history=sandbox_state["mission_history"],
-        nav=nav_for("sandbox"),
-        mode="sandbox",
-    )
+    return history_response(sandbox_state(), "sandbox")
 
 
 @app.route("/sandbox/medical", methods=["GET", "POST"])
 def sandbox_medical():
     if request.method == "POST":
-        for member in sandbox_state["crew"]:
-            if member["injury"] == "Injured":
-                member["injury"] = None
-                member["injury_days"] = 0
+        heal_crew(sandbox_state())
         return redirect(url_for("sandbox_medical"))
-    injured = [c for c in sandbox_state["crew"] if c["injury"]]
+    injured = sandbox_state()["crew"].injured_members()
     return render_template(
         "medical.html",
         injured=injured,
@@ -396,11 +1007,11 @@ def sandbox_medical():
 @app.route("/sandbox/war_machine", methods=["GET", "POST"])
 def sandbox_war_machine():
     if request.method == "POST":
-        sandbox_state["war_machine"]["integrity"] = 100
+        repair_war_machine(sandbox_state())
         return redirect(url_for("sandbox_war_machine"))
     return render_template(
         "war_machine.html",
-        wm=sandbox_state["war_machine"],
+        wm=sandbox_state()["war_machine"],
         nav=nav_for("sandbox"),
         mode="sandbox",
     )
@@ -410,22 +1021,44 @@ def sandbox_war_machine():
 def sandbox_crew():
     return render_template(
         "crew.html",
-        crew=sandbox_state["crew"],
+        crew_cards=crew_cards(sandbox_state()),
         nav=nav_for("sandbox"),
         mode="sandbox",
-        heat_tier=heat_tier,
     )
 
 
+@app.route("/sandbox/stats")
+def sandbox_stats():
+    return render_template(
+        "stats.html",
+        stats=sandbox_state()["stats"].summary(),
+        day=sandbox_state()["day"],
+        nav=nav_for("sandbox"),
+        mode="sandbox",
+    )
+
+
+@app.route("/sandbox/events")
+def sandbox_events():
+    return event_stream_response("sandbox")
+
+
 @app.route("/sandbox/lay_low", methods=["POST"])
 def sandbox_lay_low():
-    sandbox_state["global_heat"] = max(0, sandbox_state["global_heat"] - 3)
+    lay_low(sandbox_state())
+    return redirect(url_for("sandbox_index"))
+
+
+@app.route("/sandbox/fork", methods=["POST"])
+def sandbox_fork():
+    g.game.fork_sandbox()
+    assign_version(sandbox_state())
     return redirect(url_for("sandbox_index"))
 
 
 @app.route("/sandbox/espionage", methods=["POST"])
 def sandbox_espionage():
-    sandbox_state["global_heat"] = max(0, sandbox_state["global_heat"] - 6)
+    espionage(sandbox_state())
     return redirect(url_for("sandbox_index"))
 
 # -----------------------------
@@ -436,12 +1069,15 @@ def campaign_index():
     if request.method == "POST":
         action = request.form.get("action")
         if action == "advance_day":
-            advance_day(game_state)
+            advance_day(campaign_state())
+            return redirect(url_for("campaign_index"))
+        if action == "advance_days":
+            advance_days(campaign_state(), request.form.get("days", 1, type=int))
             return redirect(url_for("campaign_index"))
     return render_template(
         "index.html",
-        state=game_state,
-        advisor=advisor_for_heat(game_state["global_heat"]),
+        state=campaign_state(),
+        advisor=advisor_for_heat(campaign_state()["global_heat"]),
         nav=nav_for("campaign"),
         mode="campaign",
         heat_tier=heat_tier,
@@ -453,43 +1089,59 @@ def campaign_mission_plan():
     if request.method == "POST":
         mission_type = request.form.get("mission_type", "tech")
         selected_crew = request.form.getlist("crew")
-        preview = compute_mission_preview(game_state, mission_type, selected_crew) if selected_crew else None
+        plan = mission_plan_bundle(campaign_state(), mission_type, selected_crew) if selected_crew else {}
         return render_template(
             "mission_plan.html",
-            risk=risk_for_heat(game_state["global_heat"]),
-            advisor=advisor_for_heat(game_state["global_heat"]),
+            risk=risk_for_heat(campaign_state()["global_heat"]),
+            advisor=advisor_for_heat(campaign_state()["global_heat"]),
             nav=nav_for("campaign"),
             mode="campaign",
             heat_tier=heat_tier,
             mission_types=MISSION_TYPES,
-            crew=game_state["crew"],
+            crew=campaign_state()["crew"],
             selected_type=mission_type,
             selected_crew=selected_crew,
-            preview=preview,
+            preview=plan.get("preview"),
+            simulation=plan.get("simulation"),
+            exact_risk=plan.get("exact_risk"),
+            suggestions=cached_suggestions(campaign_state(), mission_type),
         )
 
     return render_template(
         "mission_plan.html",
-        risk=risk_for_heat(game_state["global_heat"]),
-        advisor=advisor_for_heat(game_state["global_heat"]),
+        risk=risk_for_heat(campaign_state()["global_heat"]),
+        advisor=advisor_for_heat(campaign_state()["global_heat"]),
         nav=nav_for("campaign"),
         mode="campaign",
         heat_tier=heat_tier,
         mission_types=MISSION_TYPES,
-        crew=game_state["crew"],
+        crew=campaign_state()["crew"],
         selected_type="tech",
         selected_crew=[],
         preview=None,
+        simulation=None,
+        exact_risk=None,
+        suggestions=cached_suggestions(campaign_state(), "tech"),
     )
 
 
+@app.route("/campaign/api/preview", methods=["POST"])
+def campaign_api_preview():
+    return preview_plans_response(campaign_state())
+
+
+@app.route("/campaign/api/plan")
+def campaign_api_plan():
+    return plan_response(campaign_state())
+
+
 @app.route("/campaign/launch_mission", methods=["POST"])
 def campaign_launch_mission():
     mission_type = request.form.get("mission_type", "tech")
     selected_crew = request.form.getlist("crew")
     if not selected_crew:
         return redirect(url_for("campaign_mission_plan"))
-    resolve_mission(game_state, mission_type, selected_crew)
+    resolve_mission(campaign_state(), mission_type, selected_crew)
     return redirect(url_for("campaign_mission_result"))
 
 
@@ -497,7 +1149,7 @@ def campaign_launch_mission():
 def campaign_mission_result():
     return render_template(
         "mission_result.html",
-        result=game_state["last_mission_result"],
+        result=campaign_state()["last_mission_result"],
         nav=nav_for("campaign"),
         mode="campaign",
     )
@@ -505,23 +1157,15 @@ def campaign_mission_result():
 
 @app.route("/campaign/history")
 def campaign_history():
-    return render_template(
-        "history.html",
-        history=game_state["mission_history"],
-        nav=nav_for("campaign"),
-        mode="campaign",
-    )
+    return history_response(campaign_state(), "campaign")
 
 
 @app.route("/campaign/medical", methods=["GET", "POST"])
 def campaign_medical():
     if request.method == "POST":
-        for member in game_state["crew"]:
-            if member["injury"] == "Injured":
-                member["injury"] = None
-                member["injury_days"] = 0
+        heal_crew(campaign_state())
         return redirect(url_for("campaign_medical"))
-    injured = [c for c in game_state["crew"] if c["injury"]]
+    injured = campaign_state()["crew"].injured_members()
     return render_template(
         "medical.html",
         injured=injured,
@@ -533,11 +1177,11 @@ def campaign_medical():
 @app.route("/campaign/war_machine", methods=["GET", "POST"])
 def campaign_war_machine():
     if request.method == "POST":
-        game_state["war_machine"]["integrity"] = 100
+        repair_war_machine(campaign_state())
         return redirect(url_for("campaign_war_machine"))
     return render_template(
         "war_machine.html",
-        wm=game_state["war_machine"],
+        wm=campaign_state()["war_machine"],
         nav=nav_for("campaign"),
         mode="campaign",
     )
@@ -547,26 +1191,71 @@ def campaign_war_machine():
 def campaign_crew():
     return render_template(
         "crew.html",
-        crew=game_state["crew"],
+        crew_cards=crew_cards(campaign_state()),
         nav=nav_for("campaign"),
         mode="campaign",
-        heat_tier=heat_tier,
     )
 
 
+@app.route("/campaign/stats")
+def campaign_stats():
+    return render_template(
+        "stats.html",
+        stats=campaign_state()["stats"].summary(),
+        day=campaign_state()["day"],
+        nav=nav_for("campaign"),
+        mode="campaign",
+    )
+
+
+@app.route("/campaign/events")
+def campaign_events():
+    return event_stream_response("campaign")
+
+
 @app.route("/campaign/lay_low", methods=["POST"])
 def campaign_lay_low():
-    game_state["global_heat"] = max(0, game_state["global_heat"] - 3)
+    lay_low(campaign_state())
     return redirect(url_for("campaign_index"))
 
 
 @app.route("/campaign/espionage", methods=["POST"])
 def campaign_espionage():
-    game_state["global_heat"] = max(0, game_state["global_heat"] - 6)
+    espionage(campaign_state())
     return redirect(url_for("campaign_index"))
 
+# Every view persists its session on POST (see saving_session)
+for _endpoint, _view in list(app.view_functions.items()):
+    if _endpoint != "static":
+        app.view_functions[_endpoint] = saving_session(_view)
+
+startup.mark("routes")
+
+# -----------------------------
+# APP FACTORY
+# -----------------------------
+def create_app(config: dict = None, precompile: bool = False) -> Flask:
+    """Configure and return the app; the entry point for servers and tests.
+
+        gunicorn 'app:create_app()'
+
+    Routes are registered at import, but nothing per-session is built until a
+    request needs it. Compiled templates go to an on-disk bytecode cache
+    (config JINJA_CACHE_DIR or GENESIS_JINJA_CACHE, else Jinja's private
+    per-user directory), so later workers skip compiling them; `precompile`
+    fills that cache up front.
+    """
+    if config:
+        app.config.update(config)
+    enable_bytecode_cache(app, app.config.get("JINJA_CACHE_DIR"))
+    if precompile:
+        precompile_templates(app)
+    startup.mark("templates")
+    app.logger.info("startup: %s", startup.report())
+    return app
+
 # -----------------------------
 # RUN
 # -----------------------------
 if __name__ == "__main__":
-    app.run(debug=True)
+    create_app().run(debug=True)
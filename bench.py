@@ -0,0 +1,273 @@
+# bench.py
+#
+# Benchmark suite for the game loop. Builds synthetic rosters and mission
+# histories at several scales, times the rule functions in app.py and the
+# GameEngine directly, and renders the campaign/sandbox pages through Flask's
+# test client. Results are written as JSON; given a baseline file from an
+# earlier run, any benchmark whose median got slower than the allowed ratio
+# is reported and the run exits non-zero.
+#
+#   python bench.py --out baseline.json
+#   python bench.py --baseline baseline.json --threshold 1.25
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import app
+from game_session import fork_state
+from mission_history import APP_FIELDS, ENGINE_FIELDS, MissionHistory
+from project_genesis import GameEngine
+from roster import Roster
+
+SCALES = (4, 100, 10_000, 100_000)
+MIN_TIME = 0.2      # seconds spent timing each benchmark
+MIN_RUNS = 3
+MAX_RUNS = 1000
+DEFAULT_THRESHOLD = 1.25
+
+OUTCOMES = ("Success", "Messy Success", "Failure")
+ROUTE_PAGES = ("index", "mission_plan", "history", "medical", "crew", "stats")
+
+
+# -----------------------------
+# SYNTHETIC DATA
+# -----------------------------
+def make_crew(size: int, rng: random.Random) -> list[dict]:
+    specialties = list(app.RULES.specialty_bits)
+    crew = []
+    for i in range(size):
+        injured = rng.random() < 0.1
+        crew.append({
+            "name": f"Crew{i:06d}",
+            "injury": "Injured" if injured else None,
+            "injury_days": rng.randrange(app.RECOVERY_DAYS) if injured else 0,
+            "heat_mod": rng.randrange(1, 15),
+            "specialty": rng.choice(specialties),
+            "backstory": "Synthetic benchmark operative.",
+            "relations": [],
+            "status": "Active",
+            "known_shadow": [],
+        })
+    return crew
+
+
+def make_history(size: int, crew: list[dict], rng: random.Random,
+                 fields=APP_FIELDS, retention=None) -> MissionHistory:
+    history = MissionHistory(fields, retention or max(size, 1))
+    names = [c["name"] for c in crew]
+    mission_types = list(app.MISSION_TYPES)
+    for i in range(size):
+        squad = rng.sample(names, min(3, len(names)))
+        if fields is ENGINE_FIELDS:
+            history.append({
+                "outcome": rng.choice(OUTCOMES),
+                "crew": squad,
+                "heat": rng.randrange(10),
+                "integrity_loss": rng.randrange(10),
+            })
+            continue
+        mt = rng.choice(mission_types)
+        history.append({
+            "day": i + 1,
+            "outcome": rng.choice(OUTCOMES),
+            "heat_after": rng.randrange(100),
+            "wm_integrity_after": rng.randrange(101),
+            "injuries": squad[:1] if rng.random() < 0.2 else [],
+            "mission_type": mt,
+            "mission_label": app.MISSION_TYPES[mt]["label"],
+            "crew": squad,
+            "projected_success": rng.randrange(20, 96),
+            "projected_heat_change": rng.randrange(1, 30),
+            "projected_wm_change": -rng.randrange(20),
+        })
+    return history
+
+
+def make_state(size: int, seed: int = 0) -> dict:
+    """A game state with `size` crew members and `size` history records."""
+    rng = random.Random(f"bench:{size}:{seed}")
+    crew = make_crew(size, rng)
+    state = fork_state(app.BASE_GAME_STATE)
+    state["crew"] = Roster(crew, specialty_bits=app.RULES.specialty_bits)
+    state["mission_history"] = make_history(size, crew, rng)
+    state["global_heat"] = 20
+    app.assign_version(state)
+    return state
+
+
+def make_engine(size: int, save_dir: str, seed: int = 0) -> GameEngine:
+    rng = random.Random(f"bench-engine:{size}:{seed}")
+    engine = GameEngine(save_dir=save_dir)
+    engine.state["crew"] = [
+        {"id": f"c{i}", "name": f"Crew{i:06d}", "skills": {"ops": rng.randrange(1, 5)}, "injured": False}
+        for i in range(size)
+    ]
+    engine.state["mission_history"] = make_history(
+        size, engine.state["crew"], rng, fields=ENGINE_FIELDS
+    )
+    return engine
+
+
+def squad_for(state: dict, mission_type: str) -> list[str]:
+    ready = [m["name"] for m in state["crew"].members[:50] if m["injury"] is None]
+    return ready[:app.MISSION_TYPES[mission_type]["max_crew"]]
+
+
+# -----------------------------
+# TIMING
+# -----------------------------
+def measure(fn, before=None, min_time: float = MIN_TIME) -> dict:
+    """Call `fn` until `min_time` has been spent in it; `before` is untimed."""
+    samples = []
+    spent = 0.0
+    while len(samples) < MAX_RUNS and (len(samples) < MIN_RUNS or spent < min_time):
+        if before is not None:
+            before()
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        samples.append(elapsed)
+        spent += elapsed
+    samples.sort()
+    return {
+        "runs": len(samples),
+        "median_us": round(statistics.median(samples) * 1e6, 2),
+        "p95_us": round(samples[int(0.95 * (len(samples) - 1))] * 1e6, 2),
+        "min_us": round(samples[0] * 1e6, 2),
+    }
+
+
+def engine_benchmarks(size: int, min_time: float):
+    state = make_state(size)
+    mission_type = next(iter(app.MISSION_TYPES))
+    squad = squad_for(state, mission_type)
+    rng = random.Random(f"bench-rng:{size}")
+
+    yield "compute_mission_preview", measure(
+        lambda: app.compute_mission_preview(state, mission_type, squad), min_time=min_time
+    )
+    # Keep heat from saturating so every iteration does comparable work
+    yield "resolve_mission", measure(
+        lambda: app.resolve_mission(state, mission_type, squad, rng=rng),
+        before=lambda: state.update(global_heat=20),
+        min_time=min_time,
+    )
+    yield "advance_day", measure(lambda: app.advance_day(state), min_time=min_time)
+
+    with tempfile.TemporaryDirectory() as save_dir:
+        engine = make_engine(size, save_dir)
+        crew_ids = [c["id"] for c in engine.state["crew"][:3]]
+        yield "GameEngine.resolve_mission", measure(
+            lambda: engine.resolve_mission(crew_ids), min_time=min_time
+        )
+        engine.journal.close()
+
+
+def route_benchmarks(size: int, min_time: float):
+    client = app.app.test_client()
+    with client.session_transaction() as s:
+        s["sid"] = app.SessionStore.new_id()
+        game = app.sessions.get(s["sid"])
+    mission_type = next(iter(app.MISSION_TYPES))
+
+    for mode in ("campaign", "sandbox"):
+        state = game.states[mode] = make_state(size)
+        squad = squad_for(state, mission_type)
+        requests = [("GET", page, None) for page in ROUTE_PAGES]
+        # The plan preview (odds, simulation, exact risk) only runs on POST
+        requests.append(("POST", "mission_plan", {"mission_type": mission_type, "crew": squad}))
+        for method, page, form in requests:
+            with app.app.test_request_context():
+                url = app.url_for(f"{mode}_{page}")
+
+            def call(url=url, method=method, form=form):
+                response = client.open(url, method=method, data=form)
+                if response.status_code != 200:
+                    raise RuntimeError(f"{method} {url} returned {response.status_code}")
+
+            # A fresh version per run, so each render misses the state caches
+            yield f"{method} {mode}_{page}", measure(
+                call, before=lambda state=state: app.bump_version(state), min_time=min_time
+            )
+
+
+def run_suite(scales, min_time: float = MIN_TIME, routes: bool = True) -> list[dict]:
+    results = []
+    for size in scales:
+        suites = [engine_benchmarks(size, min_time)]
+        if routes:
+            suites.append(route_benchmarks(size, min_time))
+        for suite in suites:
+            for name, timing in suite:
+                results.append({"name": name, "scale": size, **timing})
+                print(f"{name:<32} {size:>7}  {timing['median_us']:>12.1f} us", file=sys.stderr)
+    return results
+
+
+# -----------------------------
+# BASELINE COMPARISON
+# -----------------------------
+def compare(results: list[dict], baseline: dict, threshold: float) -> list[dict]:
+    """Benchmarks whose median exceeds `threshold` x their baseline median."""
+    previous = {(r["name"], r["scale"]): r for r in baseline["results"]}
+    regressions = []
+    for r in results:
+        old = previous.get((r["name"], r["scale"]))
+        if old is None or old["median_us"] <= 0:
+            continue
+        ratio = r["median_us"] / old["median_us"]
+        if ratio > threshold:
+            regressions.append({
+                "name": r["name"],
+                "scale": r["scale"],
+                "baseline_us": old["median_us"],
+                "median_us": r["median_us"],
+                "ratio": round(ratio, 2),
+            })
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Project Genesis game loop.")
+    parser.add_argument("--scales", type=int, nargs="+", default=list(SCALES))
+    parser.add_argument("--min-time", type=float, default=MIN_TIME, help="seconds per benchmark")
+    parser.add_argument("--no-routes", action="store_true", help="skip the Flask route benchmarks")
+    parser.add_argument("--baseline", help="earlier JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown ratio vs the baseline median")
+    parser.add_argument("--out", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "min_time": args.min_time,
+        "results": run_suite(args.scales, args.min_time, routes=not args.no_routes),
+    }
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["threshold"] = args.threshold
+            report["regressions"] = compare(report["results"], json.load(f), args.threshold)
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    for r in report.get("regressions", ()):
+        print(f"REGRESSION {r['name']} @ {r['scale']}: {r['baseline_us']:.1f} -> "
+              f"{r['median_us']:.1f} us ({r['ratio']}x)", file=sys.stderr)
+    if report.get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
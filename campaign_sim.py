@@ -0,0 +1,189 @@
+# campaign_sim.py
+#
+# Headless batch runner for balance tuning. Plays thousands of full campaigns
+# from BASE_GAME_STATE with the real rule functions in app.py, spread across a
+# process pool. Each campaign owns a seeded random.Random, so a run is
+# reproducible for a given --seed no matter how work lands on the workers.
+# Only aggregates are kept; individual campaign states are dropped as soon as
+# their summary has been folded in.
+#
+#   python campaign_sim.py --campaigns 5000 --days 90 --seed 7
+
+import argparse
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import app
+from game_session import fork_state
+
+# A campaign is lost when the war machine is wrecked or heat reaches the top
+# tier configured in the rules ("Critical" in the default rules.json). The
+# policy reacts to the tiers just below it, by position in the same order.
+LOSS_TIER = app.RULES.tier_names[-1]
+TIER_INDEX = {name: index for index, name in enumerate(app.RULES.tier_names)}
+LOSS_INDEX = TIER_INDEX[LOSS_TIER]
+
+
+def campaign_rng(seed: int, index: int) -> random.Random:
+    # String seeds are hashed with SHA-512, giving independent, stable streams
+    return random.Random(f"genesis:{seed}:{index}")
+
+
+def choose_action(state: dict, rng: random.Random):
+    """Simple planner policy: cool off when hot, patch up, otherwise run a job."""
+    tier = TIER_INDEX[app.heat_tier(state["global_heat"])]
+    if tier >= LOSS_INDEX - 1:  # "Severe"
+        return ("espionage",)
+    if tier >= LOSS_INDEX - 2 and rng.random() < 0.5:  # "Hot"
+        return ("lay_low",)
+    if state["war_machine"]["integrity"] <= 30:
+        return ("repair",)
+    ready = [c["name"] for c in state["crew"] if c["injury"] is None]
+    if len(ready) < 2:
+        return ("heal",)
+    mission_type = rng.choice(list(app.MISSION_TYPES))
+    size = rng.randint(1, min(app.MISSION_TYPES[mission_type]["max_crew"], len(ready)))
+    return ("mission", mission_type, rng.sample(ready, size))
+
+
+def run_campaign(args) -> dict:
+    seed, index, days = args
+    rng = campaign_rng(seed, index)
+    state = fork_state(app.BASE_GAME_STATE)
+
+    heat_by_day = []
+    outcomes = {"Success": 0, "Messy Success": 0, "Failure": 0}
+    crew_missions = 0
+    injuries = 0
+    survived = days
+    lost = False
+
+    for day in range(days):
+        action = choose_action(state, rng)
+        if action[0] == "mission":
+            _, mission_type, crew = action
+            app.resolve_mission(state, mission_type, crew, rng=rng)
+            result = state["last_mission_result"]
+            outcomes[result["outcome"]] += 1
+            crew_missions += len(crew)
+            injuries += len(result["injuries"])
+        elif action[0] == "lay_low":
+            app.lay_low(state)
+        elif action[0] == "espionage":
+            app.espionage(state)
+        elif action[0] == "heal":
+            app.heal_crew(state)
+        elif action[0] == "repair":
+            app.repair_war_machine(state)
+        app.advance_day(state)
+        heat_by_day.append(state["global_heat"])
+
+        if (
+            state["war_machine"]["integrity"] <= 0
+            or app.heat_tier(state["global_heat"]) == LOSS_TIER
+        ):
+            survived = day + 1
+            lost = True
+            break
+
+    return {
+        "survived_days": survived,
+        "lost": lost,
+        "heat_by_day": heat_by_day,
+        "outcomes": outcomes,
+        "crew_missions": crew_missions,
+        "injuries": injuries,
+    }
+
+
+class CampaignAggregate:
+    """Running totals over campaign summaries; memory is O(days), not O(campaigns)."""
+
+    def __init__(self, days: int):
+        self.days = days
+        self.campaigns = 0
+        self.completed = 0
+        self.survival_total = 0
+        self.survival_hist = [0] * (days + 1)
+        self.heat_sum = [0] * days
+        self.heat_max = [0] * days
+        self.alive = [0] * days
+        self.outcomes = {"Success": 0, "Messy Success": 0, "Failure": 0}
+        self.crew_missions = 0
+        self.injuries = 0
+
+    def add(self, summary: dict) -> None:
+        self.campaigns += 1
+        survived = summary["survived_days"]
+        self.survival_total += survived
+        self.survival_hist[survived] += 1
+        # A loss on the final day still counts as a loss
+        if not summary["lost"]:
+            self.completed += 1
+        for day, heat in enumerate(summary["heat_by_day"]):
+            self.heat_sum[day] += heat
+            self.heat_max[day] = max(self.heat_max[day], heat)
+            self.alive[day] += 1
+        for outcome, count in summary["outcomes"].items():
+            self.outcomes[outcome] += count
+        self.crew_missions += summary["crew_missions"]
+        self.injuries += summary["injuries"]
+
+    def result(self) -> dict:
+        missions = sum(self.outcomes.values())
+        return {
+            "campaigns": self.campaigns,
+            "days": self.days,
+            "completed_rate": _ratio(self.completed, self.campaigns),
+            "mean_survival_days": _ratio(self.survival_total, self.campaigns),
+            "survival_histogram": self.survival_hist,
+            "mean_heat_by_day": [
+                _ratio(total, alive) for total, alive in zip(self.heat_sum, self.alive)
+            ],
+            "max_heat_by_day": self.heat_max,
+            "outcome_rates": {k: _ratio(v, missions) for k, v in self.outcomes.items()},
+            "missions": missions,
+            "injury_rate_per_crew_mission": _ratio(self.injuries, self.crew_missions),
+        }
+
+
+def _ratio(num, den) -> float:
+    return round(num / den, 4) if den else 0.0
+
+
+def run_batch(campaigns: int, days: int, seed: int = 0, workers=None, progress=None) -> dict:
+    aggregate = CampaignAggregate(days)
+    jobs = ((seed, index, days) for index in range(campaigns))
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, campaigns // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for summary in pool.map(run_campaign, jobs, chunksize=chunksize):
+            aggregate.add(summary)
+            if progress and aggregate.campaigns % progress == 0:
+                print(f"{aggregate.campaigns}/{campaigns} campaigns", flush=True)
+    return aggregate.result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run headless Project Genesis campaigns.")
+    parser.add_argument("--campaigns", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--progress", type=int, default=0, help="print progress every N campaigns")
+    parser.add_argument("--out", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    report = run_batch(args.campaigns, args.days, args.seed, args.workers, args.progress)
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# campaign_stats.py
+#
+# Running campaign aggregates, updated in O(1) per mission (O(crew) for the
+# crew counters) and per day. Reading them never touches mission_history, so a
+# stats page costs the same on day 10 as on day 10,000.
+
+OUTCOMES = ("Success", "Messy Success", "Failure")
+
+
+class CampaignStats:
+    def __init__(self):
+        self.missions = 0
+        self.outcomes_by_type = {}
+        self.integrity_lost_by_type = {}
+        self.crew = {}
+        self.heat_tier_days = {}
+
+    def record_mission(self, result: dict, integrity_lost: int, crew) -> None:
+        """Count one mission; `crew` is the roster members that flew it, not
+        the raw names in `result`, which may repeat or name nobody."""
+        mission_type = result["mission_type"]
+        self.missions += 1
+
+        outcomes = self.outcomes_by_type.get(mission_type)
+        if outcomes is None:
+            outcomes = self.outcomes_by_type[mission_type] = dict.fromkeys(OUTCOMES, 0)
+        outcomes[result["outcome"]] += 1
+
+        self.integrity_lost_by_type[mission_type] = (
+            self.integrity_lost_by_type.get(mission_type, 0) + integrity_lost
+        )
+
+        injured = set(result["injuries"])
+        for name in (c["name"] for c in crew):
+            member = self.crew.get(name)
+            if member is None:
+                member = self.crew[name] = {"missions": 0, "injuries": 0}
+            member["missions"] += 1
+            if name in injured:
+                member["injuries"] += 1
+
+    def record_day(self, tier: str) -> None:
+        self.record_days(tier, 1)
+
+    def record_days(self, tier: str, days: int) -> None:
+        if days > 0:
+            self.heat_tier_days[tier] = self.heat_tier_days.get(tier, 0) + days
+
+    def to_dict(self) -> dict:
+        return {
+            "missions": self.missions,
+            "outcomes_by_type": self.outcomes_by_type,
+            "integrity_lost_by_type": self.integrity_lost_by_type,
+            "crew": self.crew,
+            "heat_tier_days": self.heat_tier_days,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CampaignStats":
+        stats = cls()
+        stats.missions = data["missions"]
+        stats.outcomes_by_type = data["outcomes_by_type"]
+        stats.integrity_lost_by_type = data["integrity_lost_by_type"]
+        stats.crew = data["crew"]
+        stats.heat_tier_days = data["heat_tier_days"]
+        return stats
+
+    def summary(self) -> dict:
+        by_type = {}
+        for mission_type, outcomes in self.outcomes_by_type.items():
+            total = sum(outcomes.values())
+            by_type[mission_type] = {
+                "missions": total,
+                "rates": {k: _ratio(v, total) for k, v in outcomes.items()},
+                "integrity_lost": self.integrity_lost_by_type[mission_type],
+                "integrity_lost_per_mission": _ratio(
+                    self.integrity_lost_by_type[mission_type], total
+                ),
+            }
+        crew = {
+            name: {
+                "missions": c["missions"],
+                "injuries": c["injuries"],
+                "injury_rate": _ratio(c["injuries"], c["missions"]),
+            }
+            for name, c in self.crew.items()
+        }
+        return {
+            "missions": self.missions,
+            "by_type": by_type,
+            "crew": crew,
+            "heat_tier_days": dict(self.heat_tier_days),
+        }
+
+
+def _ratio(num, den) -> float:
+    return round(num / den, 3) if den else 0.0
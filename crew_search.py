@@ -0,0 +1,98 @@
+# crew_search.py
+#
+# "Suggest crew" search for a mission type. Scores every crew subset up to the
+# mission's max_crew by projected success minus weighted heat, using the same
+# specialty bonus and heat_mod sums as app.compute_mission_preview, and prunes
+# with branch-and-bound so rosters of hundreds stay interactive.
+
+import heapq
+
+
+def suggest_crew(
+    crew: list[dict],
+    mission: dict,
+    is_specialist,
+    success_pct: tuple[int, int],
+    top_k: int = 5,
+    heat_weight: float = 1.0,
+) -> list[dict]:
+    """Return the `top_k` best crews for `mission`, best first.
+
+    `is_specialist(member)` says whether a member earns the mission's bonus and
+    `success_pct` is the projected success (without, with) a specialist. A
+    crew scores `projected_success - heat_weight * projected_heat_change`.
+    Injured members are never suggested.
+    """
+    # Per-member contribution vectors, cheapest heat first. With that order a
+    # child's bound never improves on its left sibling's, so a failed bound
+    # ends the whole sibling loop, not just one branch.
+    members = sorted(
+        (c.get("heat_mod", 0), bool(is_specialist(c)), c["name"])
+        for c in crew
+        if c["injury"] is None
+    )
+    heat = [m[0] for m in members]
+    spec = [m[1] for m in members]
+    names = [m[2] for m in members]
+    n = len(members)
+    max_crew = mission["max_crew"]
+    if n == 0 or top_k <= 0:
+        return []
+
+    # spec_after[i]: is there any specialist at index >= i?
+    spec_after = [False] * (n + 1)
+    for i in range(n - 1, -1, -1):
+        spec_after[i] = spec[i] or spec_after[i + 1]
+
+    success_lo, success_hi = success_pct
+    base_heat = mission["base_heat"]
+
+    def neg_heat(start: int, slots: int) -> int:
+        # Best heat any `slots` further picks from `start` can add: the sorted
+        # negative heat_mods at the front of the remaining range, if any.
+        total = 0
+        for h in heat[start:start + slots]:
+            if h >= 0:
+                break
+            total += h
+        return total
+
+    best = []  # min-heap of (score, -size, member indices)
+
+    def threshold() -> float:
+        return best[0][0] if len(best) >= top_k else float("-inf")
+
+    def visit(start: int, chosen: list[int], crew_heat: int, has_spec: bool) -> None:
+        slots = max_crew - len(chosen)
+        if slots == 0:
+            return
+        for j in range(start, n):
+            child_heat = crew_heat + heat[j]
+            child_spec = has_spec or spec[j]
+            success_cap = success_hi if (child_spec or spec_after[j + 1]) else success_lo
+            bound = success_cap - heat_weight * (base_heat + child_heat + neg_heat(j + 1, slots - 1))
+            if bound <= threshold():
+                break
+            chosen.append(j)
+            success = success_hi if child_spec else success_lo
+            score = success - heat_weight * (base_heat + child_heat)
+            entry = (score, -len(chosen), tuple(chosen))
+            if len(best) < top_k:
+                heapq.heappush(best, entry)
+            elif entry > best[0]:
+                heapq.heapreplace(best, entry)
+            visit(j + 1, chosen, child_heat, child_spec)
+            chosen.pop()
+
+    visit(0, [], 0, False)
+
+    results = []
+    for score, _, picked in sorted(best, reverse=True):
+        has_spec = any(spec[i] for i in picked)
+        results.append({
+            "crew": [names[i] for i in picked],
+            "projected_success": success_hi if has_spec else success_lo,
+            "projected_heat_change": base_heat + sum(heat[i] for i in picked),
+            "score": round(score, 2),
+        })
+    return results
@@ -0,0 +1,101 @@
+# events.py
+#
+# In-process pub/sub for state-change events, streamed to dashboards as
+# server-sent events. Each subscriber gets a small bounded queue; a client
+# that stops reading loses its oldest events instead of holding memory, and
+# since every delta carries the full value of each changed field, the next
+# event it does read brings it back up to date.
+
+import json
+import queue
+import threading
+
+SUBSCRIBER_QUEUE_SIZE = 32
+HEARTBEAT_SECONDS = 15.0
+
+
+class EventBroker:
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._channels = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, channel) -> queue.Queue:
+        q = queue.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._channels.setdefault(channel, set()).add(q)
+        return q
+
+    def unsubscribe(self, channel, q: queue.Queue) -> None:
+        with self._lock:
+            subscribers = self._channels.get(channel)
+            if subscribers is not None:
+                subscribers.discard(q)
+                if not subscribers:
+                    del self._channels[channel]
+
+    def has_subscribers(self, channel) -> bool:
+        return channel in self._channels
+
+    def publish(self, channel, event: dict) -> None:
+        with self._lock:
+            subscribers = list(self._channels.get(channel, ()))
+        for q in subscribers:
+            while True:
+                try:
+                    q.put_nowait(event)
+                    break
+                except queue.Full:
+                    try:
+                        q.get_nowait()
+                    except queue.Empty:
+                        pass
+
+    def stream(self, channel, initial=None, heartbeat: float = HEARTBEAT_SECONDS) -> "EventStream":
+        """SSE-formatted text for a new subscriber of `channel`.
+
+        Subscribes right away and only then calls `initial()` for the opening
+        snapshot, so nothing published in between is lost (at worst it is
+        seen twice, which a full-value delta makes harmless).
+        """
+        q = self.subscribe(channel)
+        try:
+            first = initial() if initial is not None else None
+        except BaseException:
+            self.unsubscribe(channel, q)
+            raise
+        return EventStream(self, channel, q, first, heartbeat)
+
+
+class EventStream:
+    """WSGI response iterable; `close()` unsubscribes even if never iterated."""
+
+    def __init__(self, broker: EventBroker, channel, q: queue.Queue, initial, heartbeat: float):
+        self.broker = broker
+        self.channel = channel
+        self.queue = q
+        self.initial = initial
+        self.heartbeat = heartbeat
+
+    def __iter__(self):
+        try:
+            yield "retry: 3000\n\n"
+            if self.initial is not None:
+                yield format_sse(self.initial)
+            while True:
+                try:
+                    event = self.queue.get(timeout=self.heartbeat)
+                except queue.Empty:
+                    yield ": ping\n\n"
+                    continue
+                yield format_sse(event)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self.channel, self.queue)
+
+
+def format_sse(event: dict) -> str:
+    data = json.dumps(event, separators=(",", ":"))
+    return f"event: {event.get('type', 'message')}\ndata: {data}\n\n"
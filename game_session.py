@@ -0,0 +1,127 @@
+# game_session.py
+#
+# Per-session game state. Every browser session gets its own campaign and
+# sandbox, forked from BASE_GAME_STATE without a deepcopy: a fork only copies
+# the top-level keys and shares nested containers (crew, war machine, history)
+# until the first write to them.
+
+import copy
+import threading
+import uuid
+from collections import OrderedDict
+
+MAX_SESSIONS = 1000
+
+
+class CowState(dict):
+    """A game state dict whose nested containers are copied on first write.
+
+    Scalars (day, heat, credits, ...) live directly in this dict and can be
+    assigned freely. Anything mutated in place must be fetched through
+    `writable(key)`, which gives this state a private copy the first time.
+    """
+
+    def __init__(self, base=()):
+        super().__init__(base)
+        self._owned = set()
+
+    @classmethod
+    def owning(cls, values: dict) -> "CowState":
+        """A state built from fresh containers, so none needs copying."""
+        state = cls(values)
+        state._owned.update(values)
+        return state
+
+    def writable(self, key):
+        if key not in self._owned:
+            self[key] = copy.deepcopy(self[key])
+            self._owned.add(key)
+        return self[key]
+
+    def fork(self) -> "CowState":
+        # After a fork both sides share every container again
+        self._owned.clear()
+        return CowState(self)
+
+
+def fork_state(base: dict) -> CowState:
+    if isinstance(base, CowState):
+        return base.fork()
+    return CowState(base)
+
+
+def writable(state: dict, key: str):
+    """`state[key]`, made private first when `state` is copy-on-write."""
+    if isinstance(state, CowState):
+        return state.writable(key)
+    return state[key]
+
+
+class StateConflict(Exception):
+    """Another worker saved this session since it was loaded."""
+
+
+class GameSession:
+    def __init__(self, session_id: str, base: dict):
+        self.session_id = session_id
+        self.lock = threading.RLock()
+        self.states = {
+            "campaign": fork_state(base),
+            "sandbox": fork_state(base),
+        }
+        # Per-mode bookkeeping for a persistent store (see sqlite_store)
+        self.stored = {}
+
+    def fork_sandbox(self) -> None:
+        """Replace the sandbox with an O(1) fork of the current campaign."""
+        self.states["sandbox"] = fork_state(self.states["campaign"])
+
+
+class SessionStore:
+    """Sessions keyed by id, least recently used evicted past `max_sessions`.
+
+    Only clients that change their state get a session (see app.py), so
+    cookieless traffic can't push real campaigns out of the store.
+    """
+
+    def __init__(self, base: dict, max_sessions: int = MAX_SESSIONS):
+        self.base = base
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def new_id() -> str:
+        return uuid.uuid4().hex
+
+    def get(self, session_id: str) -> GameSession:
+        with self._lock:
+            game = self._sessions.get(session_id)
+            if game is None:
+                game = GameSession(session_id, self.base)
+                self._sessions[session_id] = game
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+            else:
+                self._sessions.move_to_end(session_id)
+            return game
+
+    def transient(self) -> GameSession:
+        """A session for a client without a cookie; never stored or evicted."""
+        return GameSession(None, self.base)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    # Persistence hooks; in-memory sessions are always current. Both are
+    # called with the session lock held.
+    def refresh(self, game: GameSession) -> list[str]:
+        """Bring `game` up to date with the store; returns the reloaded modes."""
+        return []
+
+    def save(self, game: GameSession) -> None:
+        """Persist the modes of `game` that changed; may raise StateConflict."""
+
+    def reload(self, game: GameSession) -> list[str]:
+        """Drop unsaved changes in `game` and load it again from the store."""
+        return []
@@ -0,0 +1,223 @@
+# loadgen.py
+#
+# Load generator for the web app. Runs N asyncio "players", each with its own
+# session cookie, through the full campaign and sandbox loop: open the
+# dashboard, plan, preview, launch, read the result, advance the day, heal and
+# repair. By default the app is started in-process on a threaded werkzeug
+# server on a free port; pass --url to aim at an already running server
+# (e.g. serve_async.py). Reports throughput plus p50/p95/p99 latency and error
+# rate per route as JSON.
+#
+#   python loadgen.py --players 50 --duration 30
+#   python loadgen.py --url http://127.0.0.1:5000 --players 200 --modes sandbox
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+DEFAULT_PLAYERS = 10
+DEFAULT_DURATION = 10.0
+MODES = ("campaign", "sandbox")
+
+
+# -----------------------------
+# HTTP
+# -----------------------------
+class Player:
+    """One virtual player: a cookie jar and a minimal HTTP/1.1 client."""
+
+    def __init__(self, host: str, port: int, stats: dict):
+        self.host = host
+        self.port = port
+        self.stats = stats
+        self.cookies = {}
+
+    async def request(self, method: str, path: str, route: str, form=None, json_body=None):
+        body = b""
+        headers = {"Host": f"{self.host}:{self.port}", "Connection": "close"}
+        if form is not None:
+            body = urlencode(form, doseq=True).encode()
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        elif json_body is not None:
+            body = json.dumps(json_body).encode()
+            headers["Content-Type"] = "application/json"
+        if body:
+            headers["Content-Length"] = str(len(body))
+        if self.cookies:
+            headers["Cookie"] = "; ".join(f"{k}={v}" for k, v in self.cookies.items())
+        head = f"{method} {path} HTTP/1.1\r\n" + "".join(f"{k}: {v}\r\n" for k, v in headers.items())
+
+        started = time.perf_counter()
+        try:
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+            writer.write(head.encode() + b"\r\n" + body)
+            await writer.drain()
+            status = await self._read_response(reader)
+            writer.close()
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            status = None
+        elapsed = time.perf_counter() - started
+
+        entry = self.stats.setdefault(route, {"latencies": [], "errors": 0})
+        entry["latencies"].append(elapsed)
+        if status is None or status >= 400:
+            entry["errors"] += 1
+        return status
+
+    async def _read_response(self, reader) -> int:
+        status = int((await reader.readline()).split()[1])
+        while True:
+            line = (await reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            if name.lower() == "set-cookie":
+                cookie = value.strip().split(";", 1)[0]
+                key, _, val = cookie.partition("=")
+                self.cookies[key] = val
+        await reader.read()  # Connection: close, so the body runs to EOF
+        return status
+
+
+# -----------------------------
+# PLAYER FLOW
+# -----------------------------
+async def play_round(player: Player, mode: str, crew_names: list, mission_types: list, rng: random.Random):
+    index = "/" if mode == "campaign" else "/sandbox"
+    prefix = f"/{mode}"
+    mission_type = rng.choice(mission_types)
+    crew = rng.sample(crew_names, min(len(crew_names), rng.randint(1, 3)))
+    plan = {"mission_type": mission_type, "crew": crew}
+
+    await player.request("GET", index, f"GET {index}")
+    await player.request("GET", f"{prefix}/mission_plan", f"GET {prefix}/mission_plan")
+    await player.request("POST", f"{prefix}/api/preview", f"POST {prefix}/api/preview",
+                         json_body={"plans": [plan, {**plan, "heat": 0}]})
+    await player.request("POST", f"{prefix}/mission_plan", f"POST {prefix}/mission_plan", form=plan)
+    await player.request("POST", f"{prefix}/launch_mission", f"POST {prefix}/launch_mission", form=plan)
+    await player.request("GET", f"{prefix}/mission_result", f"GET {prefix}/mission_result")
+    await player.request("POST", index, f"POST {index} advance_day", form={"action": "advance_day"})
+    await player.request("POST", f"{prefix}/medical", f"POST {prefix}/medical")
+    await player.request("POST", f"{prefix}/war_machine", f"POST {prefix}/war_machine")
+
+
+async def run_player(player: Player, modes, crew_names, mission_types, deadline: float,
+                     rng: random.Random, think: float):
+    while time.perf_counter() < deadline:
+        for mode in modes:
+            await play_round(player, mode, crew_names, mission_types, rng)
+            if think:
+                await asyncio.sleep(rng.uniform(0, 2 * think))
+
+
+async def run_load(host: str, port: int, players: int, duration: float, modes, seed: int, think: float):
+    import app  # crew names and mission types for realistic plans
+
+    crew_names = [m["name"] for m in app.BASE_GAME_STATE["crew"]]
+    mission_types = list(app.MISSION_TYPES)
+    stats = {}
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        run_player(Player(host, port, stats), modes, crew_names, mission_types, deadline,
+                   random.Random(f"loadgen:{seed}:{i}"), think)
+        for i in range(players)
+    ))
+    return stats, time.perf_counter() - started
+
+
+# -----------------------------
+# REPORT
+# -----------------------------
+def percentile(sorted_values: list, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def build_report(stats: dict, elapsed: float, players: int) -> dict:
+    routes = {}
+    total = errors = 0
+    for route, entry in sorted(stats.items()):
+        latencies = sorted(entry["latencies"])
+        count = len(latencies)
+        total += count
+        errors += entry["errors"]
+        routes[route] = {
+            "requests": count,
+            "errors": entry["errors"],
+            "error_rate": round(entry["errors"] / count, 4) if count else 0.0,
+            "rps": round(count / elapsed, 1),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        }
+    return {
+        "players": players,
+        "elapsed_s": round(elapsed, 2),
+        "requests": total,
+        "errors": errors,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "throughput_rps": round(total / elapsed, 1) if elapsed else 0.0,
+        "routes": routes,
+    }
+
+
+def start_local_server():
+    """Serve app.py on a free localhost port from a background thread."""
+    from werkzeug.serving import make_server
+
+    import app
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)  # no per-request access log
+    server = make_server("127.0.0.1", 0, app.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive the Project Genesis web app with virtual players.")
+    parser.add_argument("--url", help="target server; default starts the app in-process")
+    parser.add_argument("--players", type=int, default=DEFAULT_PLAYERS, help="concurrent virtual players")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION, help="seconds to run")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--think", type=float, default=0.0, help="mean pause between rounds, seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        target = urlsplit(args.url)
+        host, port = target.hostname, target.port or 80
+    else:
+        server = start_local_server()
+        host, port = "127.0.0.1", server.server_port
+    print(f"{args.players} players against {host}:{port} for {args.duration}s", file=sys.stderr)
+
+    try:
+        stats, elapsed = asyncio.run(
+            run_load(host, port, args.players, args.duration, args.modes, args.seed, args.think)
+        )
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    report = build_report(stats, elapsed, args.players)
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# metrics.py
+#
+# Minimal in-process metrics registry rendered in the Prometheus text format.
+# Counters, gauges and fixed-bucket histograms keyed by label values; enough
+# for the app's own instrumentation without pulling in a client library.
+
+import bisect
+import threading
+
+# Seconds; finer at the low end, where most page renders land
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Metrics:
+    def __init__(self, namespace: str = "genesis"):
+        self.namespace = namespace
+        self._help = {}
+        self._types = {}
+        self._values = {}      # counters and gauges: name -> {labels: value}
+        self._histograms = {}  # name -> (buckets, {labels: [bucket counts, sum, count]})
+        self._lock = threading.Lock()
+
+    def _declare(self, name: str, kind: str, help_text: str) -> str:
+        full = f"{self.namespace}_{name}"
+        self._types[full] = kind
+        self._help[full] = help_text
+        return full
+
+    def counter(self, name: str, help_text: str) -> str:
+        full = self._declare(name, "counter", help_text)
+        self._values[full] = {}
+        return full
+
+    def gauge(self, name: str, help_text: str) -> str:
+        full = self._declare(name, "gauge", help_text)
+        self._values[full] = {}
+        return full
+
+    def histogram(self, name: str, help_text: str, buckets=LATENCY_BUCKETS) -> str:
+        full = self._declare(name, "histogram", help_text)
+        self._histograms[full] = (tuple(buckets), {})
+        return full
+
+    # -----------------------------
+    # RECORDING
+    # -----------------------------
+    def inc(self, name: str, labels: tuple = (), amount: float = 1) -> None:
+        with self._lock:
+            values = self._values[name]
+            values[labels] = values.get(labels, 0) + amount
+
+    def set(self, name: str, labels: tuple, value: float) -> None:
+        with self._lock:
+            self._values[name][labels] = value
+
+    def observe(self, name: str, labels: tuple, value: float) -> None:
+        buckets, series = self._histograms[name]
+        with self._lock:
+            entry = series.get(labels)
+            if entry is None:
+                entry = series[labels] = [[0] * len(buckets), 0.0, 0]
+            i = bisect.bisect_left(buckets, value)
+            if i < len(buckets):
+                entry[0][i] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    # -----------------------------
+    # EXPOSITION
+    # -----------------------------
+    def render(self) -> str:
+        """All series in the Prometheus text exposition format (0.0.4).
+
+        Labels are (name, value) pairs.
+        """
+        lines = []
+        with self._lock:
+            for name in self._types:
+                lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} {self._types[name]}")
+                if name in self._histograms:
+                    buckets, series = self._histograms[name]
+                    for labels, (counts, total, count) in sorted(series.items()):
+                        running = 0
+                        for bound, n in zip(buckets, counts):
+                            running += n
+                            lines.append(f"{name}_bucket{_labels(labels + (('le', _num(bound)),))} {running}")
+                        lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {count}")
+                        lines.append(f"{name}_sum{_labels(labels)} {_num(total)}")
+                        lines.append(f"{name}_count{_labels(labels)} {count}")
+                else:
+                    for labels, value in sorted(self._values[name].items()):
+                        lines.append(f"{name}{_labels(labels)} {_num(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _num(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
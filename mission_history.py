@@ -0,0 +1,339 @@
+# mission_history.py
+#
+# Columnar, bounded store for mission history records.
+#
+# Each field lives in its own array; strings (mission type, outcome, crew
+# names, ...) are interned to small ints and list fields are flattened into
+# one array plus offsets. Only the newest `retention` records are kept, and
+# pages are read newest-first by cursor so a page render never walks the
+# whole history.
+#
+# Every string field also has a secondary index, kept up to date on append:
+# one ascending array of sequence numbers per value, plus one per list field
+# for the rows where the list is not empty. `query()` intersects those posting
+# lists by leapfrogging between them with binary searches, and turns a day
+# range into a sequence range by bisecting the day column (days never go
+# backwards), so a filtered page costs about as much as the matches it skips.
+
+from array import array
+from bisect import bisect_left, bisect_right
+
+INT = "int"
+STR = "str"
+STRS = "strs"
+
+# Record layout written by app.resolve_mission
+APP_FIELDS = (
+    ("day", INT),
+    ("outcome", STR),
+    ("heat_after", INT),
+    ("wm_integrity_after", INT),
+    ("injuries", STRS),
+    ("mission_type", STR),
+    ("mission_label", STR),
+    ("crew", STRS),
+    ("projected_success", INT),
+    ("projected_heat_change", INT),
+    ("projected_wm_change", INT),
+)
+
+# Record layout written by project_genesis.GameEngine.resolve_mission
+ENGINE_FIELDS = (
+    ("outcome", STR),
+    ("crew", STRS),
+    ("heat", INT),
+    ("integrity_loss", INT),
+)
+
+DEFAULT_RETENTION = 5000
+PAGE_SIZE = 10
+
+
+class Interner:
+    def __init__(self):
+        self.values = []
+        self.ids = {}
+
+    def intern(self, value: str) -> int:
+        idx = self.ids.get(value)
+        if idx is None:
+            idx = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return idx
+
+
+class MissionHistory:
+    """Append-only mission records in array-backed columns.
+
+    Records keep a global sequence number; `page()` and `query()` cursors
+    are sequence numbers, so they stay valid while older rows are dropped by
+    retention.
+    """
+
+    def __init__(self, fields=APP_FIELDS, retention: int = DEFAULT_RETENTION):
+        self.fields = tuple(fields)
+        self.retention = retention
+        self.strings = Interner()
+        self.first_seq = 0  # sequence number of the oldest retained row
+        self.total = 0      # records ever appended
+        self._columns = {}
+        for name, kind in self.fields:
+            if kind == STRS:
+                self._columns[name] = (array("I"), array("I", [0]))  # items, offsets
+            elif kind == STR:
+                self._columns[name] = array("I")
+            else:
+                self._columns[name] = array("q")
+        # field -> {string id: array of sequence numbers}; STRS fields also
+        # have the sequence numbers of rows where the list is not empty
+        self._postings = {name: {} for name, kind in self.fields if kind in (STR, STRS)}
+        self._nonempty = {name: array("q") for name, kind in self.fields if kind == STRS}
+
+    # -----------------------------
+    # WRITING
+    # -----------------------------
+    def append(self, record: dict) -> None:
+        intern = self.strings.intern
+        seq = self.total
+        for name, kind in self.fields:
+            value = record[name]
+            column = self._columns[name]
+            if kind == STRS:
+                items, offsets = column
+                ids = [intern(v) for v in value]
+                items.extend(ids)
+                offsets.append(len(items))
+                for idx in dict.fromkeys(ids):
+                    self._post(name, idx, seq)
+                if ids:
+                    self._nonempty[name].append(seq)
+            elif kind == STR:
+                idx = intern(value)
+                column.append(idx)
+                self._post(name, idx, seq)
+            else:
+                column.append(value)
+        self.total += 1
+        # Compact in chunks so dropping old rows stays amortized O(1)
+        if len(self) >= self.retention + max(1, self.retention // 4):
+            self._drop_oldest(len(self) - self.retention)
+
+    def _post(self, name: str, idx: int, seq: int) -> None:
+        postings = self._postings[name]
+        posting = postings.get(idx)
+        if posting is None:
+            posting = postings[idx] = array("q")
+        posting.append(seq)
+
+    def _posting_lists(self):
+        for postings in self._postings.values():
+            yield from postings.values()
+        yield from self._nonempty.values()
+
+    def _drop_oldest(self, count: int) -> None:
+        for name, kind in self.fields:
+            column = self._columns[name]
+            if kind == STRS:
+                items, offsets = column
+                cut = offsets[count]
+                del items[:cut]
+                del offsets[:count]
+                for i in range(len(offsets)):
+                    offsets[i] -= cut
+            else:
+                del column[:count]
+        self.first_seq += count
+        for posting in self._posting_lists():
+            del posting[:bisect_left(posting, self.first_seq)]
+
+    def rollback(self, total: int) -> None:
+        """Drop every record appended after the history held `total` records."""
+        count = min(self.total - total, self.total - self.first_seq)
+        if count <= 0:
+            return
+        keep = self.total - self.first_seq - count
+        for name, kind in self.fields:
+            column = self._columns[name]
+            if kind == STRS:
+                items, offsets = column
+                del items[offsets[keep]:]
+                del offsets[keep + 1:]
+            else:
+                del column[keep:]
+        self.total -= count
+        for posting in self._posting_lists():
+            del posting[bisect_left(posting, self.total):]
+
+    # -----------------------------
+    # READING
+    # -----------------------------
+    def __len__(self) -> int:
+        return min(self.total - self.first_seq, self.retention)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def _start(self) -> int:
+        # Rows beyond the retention window may still sit in the arrays until
+        # the next compaction; they are never returned.
+        return (self.total - self.first_seq) - len(self)
+
+    def row(self, index: int) -> dict:
+        """Record at physical column `index` as a plain dict."""
+        values = self.strings.values
+        record = {}
+        for name, kind in self.fields:
+            column = self._columns[name]
+            if kind == STRS:
+                items, offsets = column
+                record[name] = [values[i] for i in items[offsets[index]:offsets[index + 1]]]
+            elif kind == STR:
+                record[name] = values[column[index]]
+            else:
+                record[name] = column[index]
+        return record
+
+    def __iter__(self):
+        """Retained records, oldest first."""
+        for index in range(self._start(), self.total - self.first_seq):
+            yield self.row(index)
+
+    def latest(self, count: int = PAGE_SIZE) -> list[dict]:
+        return self.page(limit=count)["records"]
+
+    def page(self, before=None, limit: int = PAGE_SIZE) -> dict:
+        """Newest-first page of records with sequence number < `before`.
+
+        Returns the records plus `next_cursor` for the following (older) page,
+        or None when there is nothing older.
+        """
+        oldest = self.first_seq + self._start()
+        end = self.total if before is None else max(oldest, min(before, self.total))
+        start = max(oldest, end - limit)
+        records = []
+        for seq in range(end - 1, start - 1, -1):
+            record = self.row(seq - self.first_seq)
+            record["seq"] = seq
+            records.append(record)
+        return {
+            "records": records,
+            "next_cursor": start if start > oldest else None,
+        }
+
+    def query(self, equals: dict = None, nonempty: dict = None, day_min: int = None,
+              day_max: int = None, newest_first: bool = True, cursor: int = None,
+              limit: int = PAGE_SIZE) -> dict:
+        """Page of records matching every filter, read through the indexes.
+
+        `equals` maps string fields to a value (for a list field, a value the
+        list contains); `nonempty` maps list fields to True or False; the day
+        bounds are inclusive. Records come newest or oldest first. `cursor` is
+        the `next_cursor` of the previous page: an exclusive upper bound on
+        sequence numbers newest-first, an inclusive lower bound oldest-first.
+        """
+        lo = self.first_seq + self._start()
+        hi = self.total
+        if day_min is not None or day_max is not None:
+            days = self._columns.get("day")
+            if days is None or dict(self.fields)["day"] != INT:
+                raise ValueError("day filters need an int 'day' field")
+            start, end = lo - self.first_seq, hi - self.first_seq
+            if day_min is not None:
+                lo = self.first_seq + bisect_left(days, day_min, start, end)
+            if day_max is not None:
+                hi = self.first_seq + bisect_right(days, day_max, start, end)
+        if cursor is not None:
+            if newest_first:
+                hi = min(hi, cursor)
+            else:
+                lo = max(lo, cursor)
+        if lo >= hi:  # inverted day range or exhausted cursor
+            return {"records": [], "next_cursor": None}
+
+        # Posting lists the matches must be in, and ones they must not be in
+        required, excluded = [], []
+        for name, value in (equals or {}).items():
+            if name not in self._postings:
+                raise ValueError(f"{name!r} is not an indexed field")
+            required.append(self._postings[name].get(self.strings.ids.get(value), array("q")))
+        for name, wanted in (nonempty or {}).items():
+            if name not in self._nonempty:
+                raise ValueError(f"{name!r} is not an indexed list field")
+            (required if wanted else excluded).append(self._nonempty[name])
+
+        matches = _leapfrog(required, lo, hi, newest_first) if required else (
+            range(hi - 1, lo - 1, -1) if newest_first else range(lo, hi)
+        )
+        records = []
+        next_cursor = None
+        for seq in matches:
+            if any(_contains(posting, seq) for posting in excluded):
+                continue
+            if len(records) == limit:
+                # There is at least one more match; resume after the last one
+                next_cursor = records[-1]["seq"] + (0 if newest_first else 1)
+                break
+            record = self.row(seq - self.first_seq)
+            record["seq"] = seq
+            records.append(record)
+        return {"records": records, "next_cursor": next_cursor}
+
+    # -----------------------------
+    # SERIALIZATION
+    # -----------------------------
+    def to_records(self) -> list[dict]:
+        return list(self)
+
+    @classmethod
+    def from_records(cls, records, fields=APP_FIELDS, retention: int = DEFAULT_RETENTION,
+                     first_seq: int = 0):
+        """Rebuild a history; `first_seq` is the sequence number of records[0]."""
+        history = cls(fields, retention)
+        history.first_seq = history.total = first_seq
+        for record in records:
+            history.append(record)
+        return history
+
+
+def _contains(posting: array, seq: int) -> bool:
+    i = bisect_left(posting, seq)
+    return i < len(posting) and posting[i] == seq
+
+
+def _leapfrog(postings: list, lo: int, hi: int, descending: bool):
+    """Sequence numbers in [lo, hi) present in every sorted posting list.
+
+    Each list is bisected straight to the current candidate, so runs of rows
+    that some list does not contain are skipped rather than walked.
+    """
+    if lo >= hi:
+        return
+    # Live window [start, end) of each list, narrowed as the walk proceeds
+    bounds = [[bisect_left(p, lo), bisect_left(p, hi)] for p in postings]
+    target = hi - 1 if descending else lo
+    agreed = 0
+    i = 0
+    while True:
+        posting, window = postings[i], bounds[i]
+        start, end = window
+        if descending:
+            j = bisect_right(posting, target, start, end) - 1
+            if j < start:
+                return
+            window[1] = j + 1
+        else:
+            j = bisect_left(posting, target, start, end)
+            if j == end:
+                return
+            window[0] = j
+        value = posting[j]
+        if value == target:
+            agreed += 1
+        else:
+            target = value
+            agreed = 1
+        if agreed == len(postings):
+            yield target
+            target += -1 if descending else 1
+            agreed = 0
+        i = (i + 1) % len(postings)
@@ -0,0 +1,71 @@
+# mission_sim.py
+#
+# Monte Carlo estimator for a planned mission.
+# Mirrors the two-stage roll and per-member injury rolls in app.resolve_mission.
+# Trials are independent, so instead of rolling each one the outcome and
+# injury-count tallies are drawn directly from their multinomial
+# distributions: the cost no longer grows with `trials`, and each preview
+# takes well under a millisecond.
+
+from math import comb
+
+import numpy as np
+
+DEFAULT_TRIALS = 100_000
+OUTCOMES = ("Success", "Messy Success", "Failure")
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def simulate_mission(
+    preview: dict,
+    heat: int,
+    integrity: int,
+    eligible_count: int,
+    injury_chance_for,
+    trials: int = DEFAULT_TRIALS,
+    seed=None,
+) -> dict:
+    """Run `trials` independent resolutions of one planned mission.
+
+    `preview` is the dict returned by compute_mission_preview, `eligible_count`
+    is how many selected crew are currently uninjured (only they roll for
+    injury) and `injury_chance_for` maps a heat value to a percentage.
+    """
+    rng = np.random.default_rng(seed)
+
+    # Heat and integrity deltas are deterministic under the current rules, so
+    # every trial ends on the same values.
+    heat_after = max(0, heat + preview["projected_heat_change"])
+    integrity_after = min(100, max(0, integrity + preview["projected_wm_change"]))
+
+    # resolve_mission: roll < 0.75 * chance is a success, roll < chance + 0.25
+    # a messy success, anything else a failure
+    success_chance = preview["projected_success"] / 100.0
+    clean = min(1.0, success_chance * 0.75)
+    messy = max(0.0, min(1.0, success_chance + 0.25) - clean)
+    outcome_counts = rng.multinomial(trials, [clean, messy, max(0.0, 1.0 - clean - messy)])
+
+    # Each eligible member is injured independently at the chance for the
+    # post-mission heat, so the injury count per trial is binomial
+    chance = injury_chance_for(heat_after) / 100.0
+    pmf = [
+        comb(eligible_count, k) * chance ** k * (1 - chance) ** (eligible_count - k)
+        for k in range(eligible_count + 1)
+    ]
+    injury_hist = rng.multinomial(trials, np.array(pmf) / sum(pmf))
+    expected = float(np.dot(np.arange(eligible_count + 1), injury_hist)) / trials
+
+    return {
+        "trials": trials,
+        "outcomes": {
+            name: round(float(count) / trials, 4) for name, count in zip(OUTCOMES, outcome_counts)
+        },
+        "injury_histogram": [round(float(count) / trials, 4) for count in injury_hist],
+        "expected_injuries": round(expected, 3),
+        "heat_percentiles": _constant_percentiles(heat_after),
+        "integrity_percentiles": _constant_percentiles(integrity_after),
+    }
+
+
+def _constant_percentiles(value: int) -> dict:
+    return {f"p{p}": value for p in PERCENTILES}
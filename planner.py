@@ -0,0 +1,324 @@
+# planner.py
+#
+# Multi-day campaign planner: depth-limited expectimax over one action per day
+# (a mission, lay low, espionage, heal, repair or just waiting), each followed
+# by a day advance, as in campaign_sim.
+#
+# Transitions are not re-implemented here. Each one runs the app's own rule
+# functions (resolve_mission, lay_low, ..., advance_day) on a small throwaway
+# state; the only chance in them is the per-member injury roll, so a mission
+# is expanded into one branch per injury pattern, forced with a scripted RNG
+# and weighted by its exact probability. Mission outcomes do not change the
+# state and are scored in closed form.
+#
+# States are reduced to a discretized node (heat and integrity snapped down to
+# small bands, never across a heat tier floor; repair days; injured crew with
+# recovery progress); a bounded transposition table keyed by
+# (state key, days left) shares work between transpositions and across
+# iterative-deepening passes. Injury patterns below MIN_BRANCH_PROB are
+# pruned (the most likely one is always kept), which keeps a mission to a
+# handful of branches. The search deepens one day at a time until the
+# requested horizon or the wall-clock budget is reached, and returns the best
+# plan from the deepest finished pass.
+
+import copy
+import itertools
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+from risk_tables import outcome_probabilities
+
+# Expected value of each outcome; a messy success counts for half
+OUTCOME_VALUES = {"Success": 1.0, "Messy Success": 0.5, "Failure": 0.0}
+HEAT_BAND = 2
+INTEGRITY_BAND = 5
+# Injury patterns less likely than this are dropped and the rest renormalized;
+# the most likely pattern is kept even when it falls below the cutoff
+MIN_BRANCH_PROB = 0.01
+TABLE_SIZE = 200_000
+DEFAULT_BUDGET = 0.5  # seconds
+
+
+class PlanNode(NamedTuple):
+    """Discretized planning state; with days left, the transposition table key."""
+    heat: int
+    integrity: int
+    repair_days: int
+    injured: tuple  # ((name, injury_days), ...) sorted by name
+
+
+class Action(NamedTuple):
+    kind: str  # "mission", "lay_low", "espionage", "heal", "repair" or "wait"
+    mission_type: str = None
+    crew: tuple = ()
+
+    def to_dict(self) -> dict:
+        if self.kind == "mission":
+            return {"action": "mission", "mission_type": self.mission_type, "crew": list(self.crew)}
+        return {"action": self.kind}
+
+
+class _Timeout(Exception):
+    pass
+
+
+class _ScriptedRng:
+    """Replays fixed rolls, so a rule function takes one chosen chance branch."""
+
+    def __init__(self, rolls):
+        self._rolls = iter(rolls)
+
+    def random(self) -> float:
+        return next(self._rolls)
+
+
+class _Sink:
+    """Stands in for mission_history/stats; the planner does not keep records."""
+
+    def append(self, record):
+        pass
+
+    def record_mission(self, result, integrity_lost, crew):
+        pass
+
+    def record_days(self, tier, days):
+        pass
+
+
+class CampaignPlanner:
+    """Expectimax planner over the app's own transition functions.
+
+    `rules` maps "mission", "lay_low", "espionage", "heal", "repair" and
+    "advance_day" to the app's state-mutating functions. `preview_fn`,
+    `injury_chance_fn` and `heat_tier_fn` are the matching read-only rules,
+    and `crew_candidates(state, mission_type)` proposes crews worth trying.
+    `roster_factory(members)` builds the crew container the rules expect.
+    """
+
+    def __init__(self, mission_types: dict, rules: dict, preview_fn, injury_chance_fn,
+                 heat_tier_fn, tier_names, heat_cap, crew_candidates, roster_factory,
+                 table_size: int = TABLE_SIZE):
+        self.mission_types = mission_types
+        self.rules = rules
+        self.preview_fn = preview_fn
+        self.injury_chance_fn = injury_chance_fn
+        self.heat_tier_fn = heat_tier_fn
+        self.tier_names = list(tier_names)
+        self.heat_cap = heat_cap  # heat at which the top tier starts
+        # Lowest heat of the tier each heat level is in, for snapping to bands
+        self.tier_floor = []
+        for heat in range(heat_cap + 1):
+            same = heat and heat_tier_fn(heat - 1) == heat_tier_fn(heat)
+            self.tier_floor.append(self.tier_floor[-1] if same else heat)
+        self.crew_candidates = crew_candidates
+        self.roster_factory = roster_factory
+        self.table_size = table_size
+
+    # -----------------------------
+    # PUBLIC
+    # -----------------------------
+    def plan(self, state: dict, days: int, max_tier: str, budget: float = DEFAULT_BUDGET) -> dict:
+        """Best action sequence for the next `days` days, keeping heat below `max_tier`.
+
+        Returns the actions along the most likely branch, the expected value
+        of following the plan, and how deep the search got in `budget` seconds.
+        """
+        search = _Search(self, state, self.tier_names.index(max_tier), time.monotonic() + budget)
+        root = search.node_of(state)
+        best = None
+        depth = 0
+        for depth in range(1, days + 1):
+            try:
+                value, _ = search.value(root, depth)
+            except _Timeout:
+                depth -= 1
+                break
+            best = value
+        return {
+            "days": days,
+            "max_tier": max_tier,
+            "depth": depth,
+            "complete": depth == days,
+            "expected_value": round(best, 3) if best is not None else None,
+            "actions": search.principal_line(root, depth),
+            "nodes": search.nodes,
+            "elapsed_ms": round((time.monotonic() - search.started) * 1000, 1),
+        }
+
+
+class _Search:
+    def __init__(self, planner: CampaignPlanner, state: dict, limit_index: int, deadline: float):
+        self.p = planner
+        self.deadline = deadline
+        self.started = time.monotonic()
+        self.limit_index = limit_index
+        self.nodes = 0
+        self.table = OrderedDict()  # (node, depth) -> (value, action)
+        self.expansions = {}        # (node, action) -> (reward, [(prob, node)])
+        self.missions = {}          # injured names -> [(action, heat change, wm change)]
+        # Static crew data; only injury fields vary between planning states, so
+        # each one copies a healthy roster and injures members by name
+        members = [m.copy() for m in state["crew"]]
+        for member in members:
+            member["injury"] = None
+            member["injury_days"] = 0
+        self.roster = planner.roster_factory(members)
+        self.day = state["day"]
+
+    # -----------------------------
+    # STATE <-> NODE
+    # -----------------------------
+    def node_of(self, state: dict) -> PlanNode:
+        wm = state["war_machine"]
+        heat = min(state["global_heat"], self.p.heat_cap)
+        heat = max(self.p.tier_floor[heat], heat - heat % HEAT_BAND)
+        injured = tuple(sorted(
+            (m["name"], m.get("injury_days", 0)) for m in state["crew"] if m["injury"] is not None
+        ))
+        integrity = wm["integrity"] - wm["integrity"] % INTEGRITY_BAND
+        return PlanNode(heat, integrity, wm.get("repair_days", 0), injured)
+
+    def state_of(self, node: PlanNode) -> dict:
+        crew = copy.deepcopy(self.roster)
+        for name, injury_days in node.injured:
+            crew.injure(name)
+            crew.get(name)["injury_days"] = injury_days
+        return {
+            "version": 0,
+            "day": self.day,
+            "global_heat": node.heat,
+            "war_machine": {
+                "integrity": node.integrity, "repair_days": node.repair_days, "upgrades": {},
+            },
+            "crew": crew,
+            "mission_history": _Sink(),
+            "stats": _Sink(),
+            "last_mission_result": None,
+            "last_mission_config": None,
+        }
+
+    # -----------------------------
+    # SEARCH
+    # -----------------------------
+    def value(self, node: PlanNode, depth: int):
+        if depth == 0:
+            return 0.0, None
+        if time.monotonic() > self.deadline:
+            raise _Timeout
+        tkey = (node, depth)
+        hit = self.table.get(tkey)
+        if hit is not None:
+            self.table.move_to_end(tkey)
+            return hit
+        self.nodes += 1
+
+        best = (float("-inf"), None)
+        for action in self.actions(node):
+            reward, branches = self.expand(node, action)
+            total = reward
+            for prob, child in branches:
+                total += prob * self.value(child, depth - 1)[0]
+            if total > best[0]:
+                best = (total, action)
+
+        self.table[tkey] = best
+        while len(self.table) > self.p.table_size:
+            self.table.popitem(last=False)
+        return best
+
+    def actions(self, node: PlanNode):
+        yield Action("wait")
+        if node.heat > 0:
+            yield Action("lay_low")
+            yield Action("espionage")
+        if node.injured:
+            yield Action("heal")
+        if node.integrity < 100:
+            yield Action("repair")
+        for action, heat_change, wm_change in self.mission_candidates(node):
+            heat_after = max(0, node.heat + heat_change)
+            if self.p.tier_names.index(self.p.heat_tier_fn(heat_after)) >= self.limit_index:
+                continue
+            if node.integrity + wm_change <= 0:
+                continue
+            yield action
+
+    def mission_candidates(self, node: PlanNode) -> list:
+        # Candidate crews and their projections only depend on who is injured
+        injured = tuple(name for name, _ in node.injured)
+        candidates = self.missions.get(injured)
+        if candidates is None:
+            state = self.state_of(node)
+            candidates = self.missions[injured] = []
+            for mission_type in self.p.mission_types:
+                for crew in self.p.crew_candidates(state, mission_type):
+                    preview = self.p.preview_fn(state, mission_type, crew)
+                    candidates.append((
+                        Action("mission", mission_type, tuple(crew)),
+                        preview["projected_heat_change"],
+                        preview["projected_wm_change"],
+                    ))
+        return candidates
+
+    def expand(self, node: PlanNode, action: Action):
+        """(immediate expected reward, [(probability, next node)]) for `action`."""
+        ekey = (node, action)
+        cached = self.expansions.get(ekey)
+        if cached is not None:
+            return cached
+        rules = self.p.rules
+        if action.kind != "mission":
+            state = self.state_of(node)
+            rules[action.kind](state)
+            rules["advance_day"](state)
+            result = (0.0, [(1.0, self.node_of(state))])
+        else:
+            state = self.state_of(node)
+            preview = self.p.preview_fn(state, action.mission_type, list(action.crew))
+            odds = outcome_probabilities(preview["projected_success"])
+            reward = sum(OUTCOME_VALUES[o] * p for o, p in odds.items())
+            heat_after = max(0, node.heat + preview["projected_heat_change"])
+            chance = self.p.injury_chance_fn(heat_after) / 100.0
+            # Rolls happen in roster order for members not already injured
+            eligible = [
+                m["name"] for m in state["crew"].select(action.crew) if m["injury"] is None
+            ]
+            patterns = []
+            for hits in itertools.product((False, True), repeat=len(eligible)):
+                prob = 1.0
+                for hit in hits:
+                    prob *= chance if hit else 1.0 - chance
+                patterns.append((prob, hits))
+            # With a big crew at a high chance every pattern can be under the
+            # cutoff; keep the likeliest so there is always a branch
+            likeliest = max(patterns, key=lambda pattern: pattern[0])
+            patterns = [p for p in patterns if p[0] >= MIN_BRANCH_PROB] or [likeliest]
+            kept = sum(prob for prob, _ in patterns)
+            branches = []
+            for prob, hits in patterns:
+                branch = self.state_of(node)
+                rolls = [0.5] + [0.0 if hit else 1.0 - 1e-9 for hit in hits]
+                rules["mission"](
+                    branch, action.mission_type, list(action.crew), rng=_ScriptedRng(rolls)
+                )
+                rules["advance_day"](branch)
+                branches.append((prob / kept, self.node_of(branch)))
+            result = (reward, branches)
+        if len(self.expansions) >= self.p.table_size:
+            self.expansions.clear()
+        self.expansions[ekey] = result
+        return result
+
+    def principal_line(self, node: PlanNode, depth: int) -> list[dict]:
+        """The plan along the most likely branch, from the table."""
+        line = []
+        for day in range(depth, 0, -1):
+            hit = self.table.get((node, day))
+            if hit is None or hit[1] is None:
+                break
+            value, action = hit
+            _, branches = self.expand(node, action)
+            line.append({**action.to_dict(), "expected_value": round(value, 3)})
+            node = max(branches, key=lambda b: b[0])[1]
+        return line
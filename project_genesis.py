@@ -1,7 +1,86 @@
 # project_genesis.py
 
+import copy
+import os
+import threading
+import time
+from typing import NamedTuple, Optional
+
+from mission_history import ENGINE_FIELDS, MissionHistory
+from save_export import ExportError, gzip_chunks, iter_export_lines, read_export
+from save_journal import SaveJournal
+
+SAVE_DIR = "saves"
+
+
+# -----------------------------
+# COMMANDS
+# -----------------------------
+class CommandError(ValueError):
+    pass
+
+
+class ResolveMission(NamedTuple):
+    crew_ids: list
+    op = "resolve_mission"
+
+
+class AdvanceTime(NamedTuple):
+    days: int = 1
+    op = "advance_time"
+
+
+class Heal(NamedTuple):
+    crew_id: Optional[str] = None
+    op = "heal"
+
+
+class Repair(NamedTuple):
+    op = "repair"
+
+
+COMMAND_TYPES = {cls.op: cls for cls in (ResolveMission, AdvanceTime, Heal, Repair)}
+
+
+def _is_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def parse_command(data: dict):
+    """Build a command from {"op": ..., **fields}, e.g. JSON from a client."""
+    if not isinstance(data, dict) or data.get("op") not in COMMAND_TYPES:
+        raise CommandError(f"unknown command: {data!r}")
+    fields = {k: v for k, v in data.items() if k != "op"}
+    try:
+        return COMMAND_TYPES[data["op"]](**fields)
+    except TypeError as e:
+        raise CommandError(f"bad fields for {data['op']}: {e}") from None
+
+
+# -----------------------------
+# IMPORT CHECKS
+# -----------------------------
+def check_imported_state(state: dict, crew: list):
+    """Raise ExportError unless `state` and `crew` have the fields the engine uses."""
+    war_machine = state.get("war_machine")
+    if not _is_int(state.get("heat")) or not (
+        isinstance(war_machine, dict) and _is_int(war_machine.get("integrity"))
+    ):
+        raise ExportError("export state needs int heat and war_machine.integrity")
+    for member in crew:
+        skills = member.get("skills")
+        if not (
+            isinstance(member.get("id"), str)
+            and isinstance(member.get("name"), str)
+            and isinstance(skills, dict)
+            and _is_int(skills.get("ops"))
+            and isinstance(member.get("injured"), bool)
+        ):
+            raise ExportError(f"malformed crew record: {member!r}")
+
+
 class GameEngine:
-    def __init__(self):
+    def __init__(self, save_dir: str = SAVE_DIR):
         self.state = {
             "crew": [
                 {"id": "c1", "name": "Artemis", "skills": {"ops": 3}, "injured": False},
@@ -10,13 +89,102 @@ class GameEngine:
             ],
             "heat": 0,
             "war_machine": {"integrity": 100},
-            "mission_history": []
+            "mission_history": MissionHistory(ENGINE_FIELDS)
         }
         self.last_mission_report = None
+        self.save_dir = save_dir
+        self.journal = SaveJournal(save_dir)
+        self._replaying = False
+        # Serializes batches so one request's rollback can't undo another's
+        self._lock = threading.Lock()
 
     def get_actions(self):
         return ["Prepare mission", "Advance time"]
 
+    # -----------------------------
+    # COMMAND PIPELINE
+    # -----------------------------
+    def command_for_action(self, choice):
+        if choice == 0:
+            ready = [c["id"] for c in self.state["crew"] if not c["injured"]]
+            return ResolveMission(ready)
+        if choice == 1:
+            return AdvanceTime()
+        raise CommandError(f"unknown action: {choice!r}")
+
+    def execute(self, choice):
+        """Run one menu action (an index into get_actions()) or one command."""
+        command = self.command_for_action(choice) if isinstance(choice, int) else choice
+        self.execute_batch([command])
+
+    def validate(self, command):
+        crew_ids = {c["id"] for c in self.state["crew"]}
+        if isinstance(command, ResolveMission):
+            if (
+                not command.crew_ids
+                or not isinstance(command.crew_ids, list)
+                or not all(isinstance(i, str) for i in command.crew_ids)
+            ):
+                raise CommandError("resolve_mission needs a non-empty list of crew id strings")
+            unknown = set(command.crew_ids) - crew_ids
+            if unknown:
+                raise CommandError(f"unknown crew: {sorted(unknown)}")
+        elif isinstance(command, AdvanceTime):
+            if not _is_int(command.days) or command.days < 1:
+                raise CommandError("advance_time needs days >= 1")
+        elif isinstance(command, Heal):
+            if command.crew_id is not None and (
+                not isinstance(command.crew_id, str) or command.crew_id not in crew_ids
+            ):
+                raise CommandError(f"unknown crew: {command.crew_id!r}")
+        elif not isinstance(command, Repair):
+            raise CommandError(f"not a command: {command!r}")
+
+    def execute_batch(self, commands):
+        """Validate every command, apply them all or none, then save once.
+
+        The batch is journaled as a single record, so N scripted actions cost
+        one journal write and one save instead of N of each. Returns a copy
+        of the state without its mission history, plus the history records
+        the batch appended (newest first) under "new_missions".
+        """
+        commands = list(commands)
+        with self._lock:
+            return self._execute_batch(commands)
+
+    def _execute_batch(self, commands):
+        # Validation can't see the effects of earlier commands in the batch;
+        # anything that only fails mid-batch is caught by the rollback below.
+        for command in commands:
+            self.validate(command)
+
+        # History is append-only, so it is rolled back by length instead of
+        # being copied with the rest of the state.
+        history = self.state["mission_history"]
+        history_total = history.total
+        saved = {k: copy.deepcopy(v) for k, v in self.state.items() if k != "mission_history"}
+        saved_report = self.last_mission_report
+
+        self._replaying = True
+        try:
+            for command in commands:
+                getattr(self, command.op)(*command)
+        except Exception:
+            history.rollback(history_total)
+            self.state = {**saved, "mission_history": history}
+            self.last_mission_report = saved_report
+            raise
+        finally:
+            self._replaying = False
+
+        self._record("batch", [[command.op, list(command)] for command in commands])
+        self.save_game()
+        # Copied under the lock, so the caller can serialize it while other
+        # batches run
+        result = {k: copy.deepcopy(v) for k, v in self.state.items() if k != "mission_history"}
+        result["new_missions"] = history.latest(history.total - history_total)
+        return result
+
     def resolve_mission(self, crew_ids):
         total_ops = sum(
             c["skills"]["ops"]
@@ -50,9 +218,122 @@ class GameEngine:
             "integrity_loss": integrity_loss,
         }
 
-        self.state["mission_history"].insert(0, entry)
+        self.state["mission_history"].append(entry)
         self.last_mission_report = entry
+        self._record("resolve_mission", [crew_ids])
 
-    def advance_time(self):
+    def advance_time(self, days=1):
         # Placeholder for future recovery / decay
-        pass
+        self._record("advance_time", [days])
+
+    def heal(self, crew_id=None):
+        for member in self.state["crew"]:
+            if crew_id is None or member["id"] == crew_id:
+                member["injured"] = False
+        self._record("heal", [crew_id])
+
+    def repair(self):
+        self.state["war_machine"]["integrity"] = 100
+        self._record("repair", [])
+
+    # -----------------------------
+    # PERSISTENCE
+    # -----------------------------
+    def _record(self, op, args):
+        if not self._replaying:
+            self.journal.append(op, args)
+
+    def _replay(self, records):
+        self._replaying = True
+        try:
+            for record in records:
+                if record["op"] == "batch":
+                    for op, args in record["args"]:
+                        getattr(self, op)(*args)
+                else:
+                    getattr(self, record["op"])(*record["args"])
+        finally:
+            self._replaying = False
+
+    def load_game(self):
+        """Restore the latest snapshot, then replay the journal written after it."""
+        snapshot, records = self.journal.load()
+        if snapshot is not None:
+            self.state = snapshot["state"]
+            self.state["mission_history"] = MissionHistory.from_records(
+                self.state["mission_history"], ENGINE_FIELDS
+            )
+            self.last_mission_report = snapshot["last_mission_report"]
+        self._replay(records)
+
+    def save_game(self):
+        # Actions are already journaled; saving only pushes them to the OS
+        # (fsync is batched inside the journal) and snapshots once the
+        # journal has grown large relative to the last snapshot.
+        self.journal.flush()
+        self.journal.sync_if_due()
+        if self.journal.needs_snapshot():
+            self.journal.snapshot({
+                "state": self.plain_state(self.state),
+                "last_mission_report": self.last_mission_report,
+            })
+
+    def close(self):
+        """fsync and close the journal; call before the process exits."""
+        self.journal.close()
+
+    # -----------------------------
+    # EXPORT / IMPORT
+    # -----------------------------
+    def export_stream(self, state=None):
+        """Gzip NDJSON export of `state` as an iterator of compressed chunks.
+
+        The state is copied up front (the history as its compact column
+        arrays), so actions applied while the stream is read cannot make the
+        rows disagree with the header.
+        """
+        with self._lock:
+            state = copy.deepcopy(self.state if state is None else state)
+            report = copy.deepcopy(self.last_mission_report)
+        return gzip_chunks(iter_export_lines(state, report))
+
+    def export_save(self, state):
+        os.makedirs(self.save_dir, exist_ok=True)
+        filename = os.path.join(
+            self.save_dir, time.strftime("export-%Y%m%d-%H%M%S.ndjson.gz")
+        )
+        tmp = filename + ".tmp"
+        with open(tmp, "wb") as f:
+            for chunk in self.export_stream(state):
+                f.write(chunk)
+        os.replace(tmp, filename)
+        return filename
+
+    def import_save(self, fileobj):
+        """Replace the current game with an export read from a binary file.
+
+        History rows are streamed into the bounded MissionHistory, so only its
+        retention window is ever held in memory. Raises save_export.ExportError
+        for a file that is not a valid export.
+        """
+        header, crew, rows = read_export(fileobj)
+        check_imported_state(header["state"], crew)
+        history = MissionHistory(ENGINE_FIELDS)
+        for record in rows:
+            try:
+                history.append(record)
+            except (KeyError, TypeError) as e:
+                raise ExportError(f"malformed history record: {e!r}") from None
+        with self._lock:
+            self.state = {**header["state"], "crew": crew, "mission_history": history}
+            self.last_mission_report = header["last_mission_report"]
+            # The journal describes the old game; snapshot the imported one so
+            # load_game starts from it
+            self.journal.snapshot({
+                "state": self.plain_state(self.state),
+                "last_mission_report": self.last_mission_report,
+            })
+
+    @staticmethod
+    def plain_state(state):
+        return {**state, "mission_history": state["mission_history"].to_records()}
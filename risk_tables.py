@@ -0,0 +1,110 @@
+# risk_tables.py
+#
+# Exact, sampling-free risk evaluation for the rules in app.resolve_mission.
+# Outcome probabilities are closed-form in the projected success chance, and the
+# number of injuries is Poisson-binomial over the eligible crew. Both are kept in
+# lookup tables so a preview is a couple of dict hits.
+
+from itertools import combinations
+from math import comb
+
+OUTCOMES = ("Success", "Messy Success", "Failure")
+
+# Eagerly tabulate every crew subset only while the roster is small; larger
+# rosters fill the same table lazily, one crew set at a time.
+EAGER_SUBSET_LIMIT = 5000
+
+
+def outcome_probabilities(success_pct: int) -> dict:
+    """Closed form of the two-stage roll: Success below 0.75p, Messy below p+0.25."""
+    p = success_pct / 100.0
+    success = min(1.0, p * 0.75)
+    messy = min(1.0, p + 0.25) - success
+    return {
+        "Success": success,
+        "Messy Success": messy,
+        "Failure": 1.0 - success - messy,
+    }
+
+
+def injury_distribution(chances) -> list[float]:
+    """P(k injuries) for independent per-member chances (Poisson-binomial DP)."""
+    dist = [1.0]
+    for q in chances:
+        nxt = [0.0] * (len(dist) + 1)
+        for k, pk in enumerate(dist):
+            nxt[k] += pk * (1.0 - q)
+            nxt[k + 1] += pk * q
+        dist = nxt
+    return dist
+
+
+class RiskTables:
+    """Lookup tables indexed by mission type, post-mission heat and crew set.
+
+    `preview_fn(state, mission_type, names)` and `injury_chance_fn(heat)` are the
+    app's own rule functions, so the tables can never drift from resolve_mission.
+    `crew_key_fn(state, names)` must capture everything about the named members
+    that the preview depends on; it keys the outcome table, so the table grows
+    with distinct crew profiles rather than with the names clients send.
+    """
+
+    def __init__(self, mission_types: dict, preview_fn, injury_chance_fn, injury_chances,
+                 crew_key_fn):
+        self.mission_types = mission_types
+        self.preview_fn = preview_fn
+        self.injury_chance_fn = injury_chance_fn
+        self.crew_key_fn = crew_key_fn
+        self.outcome_table = {}
+        max_crew = max(mt["max_crew"] for mt in mission_types.values())
+        # Every selected member rolls at the same tier chance, so the injury
+        # distribution only depends on (chance, eligible count).
+        self.injury_table = {
+            (chance, n): injury_distribution([chance / 100.0] * n)
+            for chance in injury_chances
+            for n in range(max_crew + 1)
+        }
+
+    def precompute(self, state: dict) -> None:
+        names = [c["name"] for c in state["crew"]]
+        for mission_type, mt in self.mission_types.items():
+            sizes = range(1, min(mt["max_crew"], len(names)) + 1)
+            if sum(comb(len(names), k) for k in sizes) > EAGER_SUBSET_LIMIT:
+                continue
+            for k in sizes:
+                for combo in combinations(names, k):
+                    self._outcome_entry(state, mission_type, list(combo))
+
+    def lookup(self, state: dict, mission_type: str, selected_crew_names: list[str], heat=None) -> dict:
+        """Exact risk of the plan, at `heat` instead of the state's heat if given."""
+        # Unknown names never reach the table key
+        members = state["crew"].select(selected_crew_names)
+        entry = self._outcome_entry(state, mission_type, [c["name"] for c in members])
+        if heat is None:
+            heat = state["global_heat"]
+        heat_after = max(0, heat + entry["projected_heat_change"])
+        chance = self.injury_chance_fn(heat_after)
+        eligible = sum(1 for c in members if c["injury"] is None)
+        dist = self.injury_table.get((chance, eligible))
+        if dist is None:
+            dist = injury_distribution([chance / 100.0] * eligible)
+            self.injury_table[(chance, eligible)] = dist
+        return {
+            "outcomes": entry["outcomes"],
+            "injury_distribution": dist,
+            "expected_injuries": eligible * chance / 100.0,
+            "heat_after": heat_after,
+            "injury_chance": chance,
+        }
+
+    def _outcome_entry(self, state: dict, mission_type: str, names: list[str]) -> dict:
+        key = (mission_type, self.crew_key_fn(state, names))
+        entry = self.outcome_table.get(key)
+        if entry is None:
+            preview = self.preview_fn(state, mission_type, names)
+            entry = {
+                "projected_heat_change": preview["projected_heat_change"],
+                "outcomes": outcome_probabilities(preview["projected_success"]),
+            }
+            self.outcome_table[key] = entry
+        return entry
@@ -0,0 +1,101 @@
+# roster.py
+#
+# Indexed crew roster. Keeps CrewMember records (see state_model), plus a
+# name -> member index, a precomputed specialty bitmask per member and the set
+# of injured members, so lookups and injury sweeps cost O(selected) or
+# O(injured) instead of scanning the whole roster.
+
+from state_model import CrewMember
+
+
+def specialty_mask(specialty: str, specialty_bits: dict) -> int:
+    """Bitmask of the known specialties named anywhere in `specialty`."""
+    mask = 0
+    for word, bit in specialty_bits.items():
+        if word in specialty:
+            mask |= bit
+    return mask
+
+
+class Roster:
+    """`specialty_bits` maps specialty names to bits (see rules.Rules).
+
+    Members may be given as plain dicts; they are stored as CrewMember.
+    """
+
+    def __init__(self, members=(), specialty_bits=None):
+        self.specialty_bits = specialty_bits or {}
+        self.members = []
+        self.by_name = {}
+        self.index = {}
+        self.masks = {}
+        self.injured = set()
+        for member in members:
+            self.add(member)
+
+    def add(self, member) -> None:
+        if not isinstance(member, CrewMember):
+            member = CrewMember.from_dict(member)
+        name = member.name
+        self.index[name] = len(self.members)
+        self.members.append(member)
+        self.by_name[name] = member
+        self.masks[name] = specialty_mask(member.specialty, self.specialty_bits)
+        if member.injury:
+            self.injured.add(name)
+
+    def __deepcopy__(self, memo):
+        # Profiles and specialty bits are shared; only the per-member records
+        # and the tables pointing at them are copied
+        clone = Roster.__new__(Roster)
+        clone.specialty_bits = self.specialty_bits
+        clone.members = [member.__copy__() for member in self.members]
+        clone.by_name = {member.name: member for member in clone.members}
+        clone.index = dict(self.index)
+        clone.masks = dict(self.masks)
+        clone.injured = set(self.injured)
+        return clone
+
+    # -----------------------------
+    # LOOKUPS
+    # -----------------------------
+    def __iter__(self):
+        return iter(self.members)
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    def __getitem__(self, i):
+        return self.members[i]
+
+    def get(self, name: str):
+        return self.by_name.get(name)
+
+    def select(self, names) -> list[dict]:
+        """Members named in `names`, in roster order; unknown names are ignored."""
+        found = {self.index[n] for n in names if n in self.index}
+        return [self.members[i] for i in sorted(found)]
+
+    def mask_of(self, names) -> int:
+        mask = 0
+        for name in names:
+            mask |= self.masks.get(name, 0)
+        return mask
+
+    def injured_members(self) -> list[dict]:
+        return [self.members[i] for i in sorted(self.index[n] for n in self.injured)]
+
+    # -----------------------------
+    # INJURIES
+    # -----------------------------
+    def injure(self, name: str) -> None:
+        member = self.by_name[name]
+        member.injury = "Injured"
+        member.injury_days = 0
+        self.injured.add(name)
+
+    def heal(self, name: str) -> None:
+        member = self.by_name[name]
+        member.injury = None
+        member.injury_days = 0
+        self.injured.discard(name)
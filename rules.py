@@ -0,0 +1,72 @@
+# rules.py
+#
+# Game rules loaded from rules.json and compiled at startup into flat lookup
+# tables: heat -> tier index, tier -> injury chance / advisor, and per mission
+# type a specialty-mask -> projected success table. Previews then become plain
+# indexing with no per-mission branches, and a new mission type is a rules
+# file edit.
+
+import json
+import os
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rules.json")
+
+
+class Rules:
+    def __init__(self, raw: dict):
+        self.specialty_bits = {
+            name: 1 << i for i, name in enumerate(raw["specialties"])
+        }
+
+        tiers = raw["heat_tiers"]
+        if not tiers or tiers[0]["min_heat"] != 0:
+            raise ValueError("heat_tiers must start at min_heat 0")
+        floors = [t["min_heat"] for t in tiers]
+        if floors != sorted(set(floors)):
+            raise ValueError("heat_tiers must have strictly increasing min_heat")
+        self.tier_names = [t["name"] for t in tiers]
+        self.heat_tier_floors = tuple(floors[1:])
+        self.injury_chance_by_tier = {t["name"]: t["injury_chance"] for t in tiers}
+        self.advisor_by_tier = {t["name"]: dict(t["advisor"]) for t in tiers}
+        # tier_by_heat[h] for 0 <= h <= last floor; anything hotter is the top tier
+        self.tier_by_heat = []
+        for index, tier in enumerate(tiers):
+            upper = floors[index + 1] if index + 1 < len(floors) else floors[-1] + 1
+            self.tier_by_heat.extend([tier["name"]] * (upper - tier["min_heat"]))
+        self.max_tier_heat = len(self.tier_by_heat) - 1
+
+        success = raw["success"]
+        self.mission_types = {}
+        self.mission_masks = {}
+        self.success_by_mask = {}
+        for key, mt in raw["mission_types"].items():
+            unknown = set(mt["specialties"]) - set(self.specialty_bits)
+            if unknown:
+                raise ValueError(f"mission type {key!r} uses unknown specialties {sorted(unknown)}")
+            self.mission_types[key] = {k: v for k, v in mt.items() if k != "specialties"}
+            mask = 0
+            for name in mt["specialties"]:
+                mask |= self.specialty_bits[name]
+            self.mission_masks[key] = mask
+            with_bonus = _clamp_pct(mt["base_success"] + success["specialty_bonus"], success)
+            without = _clamp_pct(mt["base_success"] - success["no_specialty_penalty"], success)
+            self.success_by_mask[key] = [
+                with_bonus if crew_mask & mask else without
+                for crew_mask in range(1 << len(self.specialty_bits))
+            ]
+
+    def heat_tier(self, heat: int) -> str:
+        return self.tier_by_heat[min(max(heat, 0), self.max_tier_heat)]
+
+    def success_pct(self, mission_type: str, has_specialist: bool) -> int:
+        mask = self.mission_masks[mission_type] if has_specialist else 0
+        return self.success_by_mask[mission_type][mask]
+
+
+def _clamp_pct(chance: float, success: dict) -> int:
+    return round(max(success["floor"], min(success["ceiling"], chance)) * 100)
+
+
+def load_rules(path: str = DEFAULT_RULES_PATH) -> Rules:
+    with open(path, "r", encoding="utf-8") as f:
+        return Rules(json.load(f))
@@ -0,0 +1,140 @@
+# save_export.py
+#
+# Portable save exports for GameEngine: gzip-compressed NDJSON, written and
+# read as a stream.
+#
+# Line 1 is a header (format, version, the scalar state and the last mission
+# report); then one line per crew member and one per mission history record,
+# oldest first. Export never builds the whole document: lines are encoded one
+# at a time and compressed in fixed-size chunks, so memory stays flat however
+# long the history is. Import reads the header and crew eagerly and hands the
+# history back as a lazy iterator, so the caller decides how much of it to
+# keep (GameEngine keeps its bounded MissionHistory window).
+
+import gzip
+import json
+import zlib
+
+FORMAT = "genesis-export"
+VERSION = 1
+CHUNK_SIZE = 64 * 1024
+COMPRESS_LEVEL = 6
+
+
+class ExportError(ValueError):
+    pass
+
+
+# -----------------------------
+# EXPORT
+# -----------------------------
+def iter_export_lines(state: dict, last_mission_report=None):
+    """Encoded NDJSON lines for `state`: header, crew, then history rows."""
+    scalars = {k: v for k, v in state.items() if k not in ("crew", "mission_history")}
+    history = state["mission_history"]
+    header = {
+        "type": "header",
+        "format": FORMAT,
+        "version": VERSION,
+        "state": scalars,
+        "last_mission_report": last_mission_report,
+        "crew_count": len(state["crew"]),
+        "history_count": len(history),
+    }
+    yield _line(header)
+    for member in state["crew"]:
+        yield _line({"type": "crew", "data": member})
+    for record in history:
+        yield _line({"type": "history", "data": record})
+
+
+def gzip_chunks(lines, chunk_size: int = CHUNK_SIZE, level: int = COMPRESS_LEVEL):
+    """Gzip a stream of byte strings, yielding compressed chunks as they fill."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # gzip container
+    buffered = []
+    size = 0
+    for line in lines:
+        buffered.append(line)
+        size += len(line)
+        if size >= chunk_size:
+            chunk = compressor.compress(b"".join(buffered))
+            buffered, size = [], 0
+            if chunk:
+                yield chunk
+    yield compressor.compress(b"".join(buffered)) + compressor.flush()
+
+
+def _line(obj) -> bytes:
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+# -----------------------------
+# IMPORT
+# -----------------------------
+def read_export(fileobj):
+    """Parse a gzip NDJSON export from a binary file object.
+
+    Returns (header, crew, history) where `history` is an iterator of records
+    that reads the rest of the stream on demand; consume it before closing
+    `fileobj`.
+    """
+    lines = _records(gzip.GzipFile(fileobj=fileobj, mode="rb"))
+    header = next(lines, None)
+    if (
+        header is None
+        or header.get("type") != "header"
+        or header.get("format") != FORMAT
+    ):
+        raise ExportError("not a save export")
+    if header.get("version") != VERSION:
+        raise ExportError(f"unsupported export version: {header.get('version')!r}")
+    if (
+        not isinstance(header.get("state"), dict)
+        or "last_mission_report" not in header
+        or not isinstance(header.get("crew_count"), int)
+    ):
+        raise ExportError("malformed export header")
+
+    crew = []
+    first_history = None
+    for line in lines:
+        if line.get("type") == "crew":
+            crew.append(_data(line))
+        else:
+            first_history = line
+            break
+    if len(crew) != header["crew_count"]:
+        raise ExportError("export truncated in crew section")
+    return header, crew, _history(first_history, lines)
+
+
+def _records(stream):
+    try:
+        for raw in stream:
+            if raw.strip():
+                record = json.loads(raw)
+                if not isinstance(record, dict):
+                    raise ValueError("every line must be a JSON object")
+                yield record
+    except (OSError, EOFError, ValueError) as e:  # bad gzip data or JSON
+        raise ExportError(f"corrupt export: {e}") from None
+
+
+def _history(first, lines):
+    if first is not None:
+        yield _history_data(first)
+    for line in lines:
+        yield _history_data(line)
+
+
+def _history_data(line: dict) -> dict:
+    if line.get("type") != "history":
+        raise ExportError(f"unexpected line in history section: {line.get('type')!r}")
+    return _data(line)
+
+
+def _data(line: dict) -> dict:
+    data = line.get("data")
+    if not isinstance(data, dict):
+        raise ExportError(f"{line.get('type')} line without a data object")
+    return data
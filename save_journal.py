@@ -0,0 +1,152 @@
+# save_journal.py
+#
+# Write-ahead journal with periodic snapshots for GameEngine saves.
+#
+# Every action is appended as one compact JSON line to journal.ndjson; nothing
+# rewrites the whole state on save. fsync is batched (every `fsync_every`
+# records or `fsync_interval` seconds, whichever comes first); `close()` syncs
+# whatever is left before the process exits. Once the journal has grown to a
+# fixed fraction of the last snapshot a new snapshot is written atomically and
+# the journal is truncated, so snapshot cost stays amortized O(1) per action.
+# Recovery loads snapshot.json and replays the journal tail.
+
+import json
+import os
+import time
+
+SNAPSHOT_FILE = "snapshot.json"
+JOURNAL_FILE = "journal.ndjson"
+
+
+class SaveJournal:
+    def __init__(
+        self,
+        save_dir: str,
+        fsync_every: int = 32,
+        fsync_interval: float = 1.0,
+        min_journal_bytes: int = 64 * 1024,
+        snapshot_ratio: float = 1.0,
+    ):
+        self.save_dir = save_dir
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.min_journal_bytes = min_journal_bytes
+        self.snapshot_ratio = snapshot_ratio
+
+        self.seq = 0
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._journal_bytes = 0
+        self._snapshot_bytes = 0
+
+    @property
+    def snapshot_path(self) -> str:
+        return os.path.join(self.save_dir, SNAPSHOT_FILE)
+
+    @property
+    def journal_path(self) -> str:
+        return os.path.join(self.save_dir, JOURNAL_FILE)
+
+    # -----------------------------
+    # RECOVERY
+    # -----------------------------
+    def load(self):
+        """Return (snapshot payload or None, journal records newer than it)."""
+        snapshot = None
+        snapshot_seq = 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            snapshot_seq = snapshot["seq"]
+            self._snapshot_bytes = os.path.getsize(self.snapshot_path)
+
+        records = []
+        self.seq = snapshot_seq
+        if os.path.exists(self.journal_path):
+            good_bytes = 0
+            with open(self.journal_path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # torn final write from a crash
+                    good_bytes += len(line)
+                    record = json.loads(line)
+                    if record["seq"] > snapshot_seq:
+                        records.append(record)
+                        self.seq = record["seq"]
+            if good_bytes != os.path.getsize(self.journal_path):
+                # Drop the torn tail so new appends start on a clean line
+                with open(self.journal_path, "r+b") as f:
+                    f.truncate(good_bytes)
+            self._journal_bytes = good_bytes
+
+        return (snapshot["state"] if snapshot else None), records
+
+    # -----------------------------
+    # WRITING
+    # -----------------------------
+    def append(self, op: str, args) -> None:
+        self.seq += 1
+        line = json.dumps({"seq": self.seq, "op": op, "args": args}, separators=(",", ":")) + "\n"
+        f = self._open()
+        f.write(line)
+        self._journal_bytes += len(line)
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every:
+            self.sync()
+        else:
+            self.sync_if_due()
+
+    def sync_if_due(self) -> None:
+        """fsync if records have waited at least `fsync_interval` seconds."""
+        if self._unsynced and time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.sync()
+
+    def flush(self) -> None:
+        # Hand buffered records to the OS; durability still waits for sync()
+        if self._file is not None:
+            self._file.flush()
+
+    def sync(self) -> None:
+        if self._file is None or not self._unsynced:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def needs_snapshot(self) -> bool:
+        return self._journal_bytes >= max(
+            self.min_journal_bytes, self._snapshot_bytes * self.snapshot_ratio
+        )
+
+    def snapshot(self, state: dict) -> None:
+        """Atomically persist `state` as of the current seq and reset the journal."""
+        self.sync()
+        os.makedirs(self.save_dir, exist_ok=True)
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"seq": self.seq, "state": state}, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        self._snapshot_bytes = os.path.getsize(self.snapshot_path)
+
+        # Everything in the journal is now covered by the snapshot. A crash
+        # before this truncate is harmless: load() skips seq <= snapshot seq.
+        self.close()
+        with open(self.journal_path, "w", encoding="utf-8"):
+            pass
+        self._journal_bytes = 0
+
+    def close(self) -> None:
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    def _open(self):
+        if self._file is None:
+            os.makedirs(self.save_dir, exist_ok=True)
+            self._file = open(self.journal_path, "a", encoding="utf-8")
+        return self._file
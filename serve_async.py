@@ -0,0 +1,33 @@
+# serve_async.py
+#
+# Async serving mode. Runs the app on gevent's WSGI server so each open
+# /campaign/events or /sandbox/events stream is a cheap greenlet parked on its
+# queue instead of an OS thread; hundreds of idle dashboards cost little.
+#
+#   pip install gevent
+#   python serve_async.py --host 0.0.0.0 --port 5000
+
+from gevent import monkey
+
+# Must run before anything imports threading/queue/socket
+monkey.patch_all()
+
+import argparse  # noqa: E402
+
+from gevent.pywsgi import WSGIServer  # noqa: E402
+
+from app import create_app  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve Project Genesis with gevent.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    args = parser.parse_args()
+    print(f"Serving on http://{args.host}:{args.port} (async mode)")
+    app = create_app({"LIVE_EVENTS": True})  # streams are cheap greenlets here
+    WSGIServer((args.host, args.port), app).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+# sqlite_store.py
+#
+# Session state shared between worker processes through one SQLite database
+# in WAL mode, so several gunicorn workers can serve the same sessions.
+#
+# Each (session, mode) state is stored row by row: one `states` row with the
+# scalars, a revision counter and the stats blob, one `war_machine` row, one
+# `crew` row per member and one `history` row per retained mission. Workers
+# keep a session's states in memory and only reload a mode when its revision
+# in the database has moved. Saves are optimistic: the `states` row is updated
+# only if its revision is still the one this worker loaded, otherwise the
+# whole save is rolled back and StateConflict is raised so the request can be
+# retried on fresh state. Only rows that changed are written.
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import NamedTuple
+
+from campaign_stats import CampaignStats
+from game_session import CowState, SessionStore, StateConflict, fork_state
+from mission_history import MissionHistory
+from roster import Roster
+from state_model import MissionRecord, WarMachine
+
+POOL_SIZE = 8
+BUSY_TIMEOUT = 5.0  # seconds to wait for another writer's lock
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS states (
+    session_id TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    rev INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    credits INTEGER NOT NULL,
+    global_heat INTEGER NOT NULL,
+    history_total INTEGER NOT NULL,
+    stats TEXT NOT NULL,
+    last_mission_result TEXT,
+    last_mission_config TEXT,
+    PRIMARY KEY (session_id, mode)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS war_machine (
+    session_id TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    integrity INTEGER NOT NULL,
+    repair_days INTEGER NOT NULL,
+    upgrades TEXT NOT NULL,
+    PRIMARY KEY (session_id, mode)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS crew (
+    session_id TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    name TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (session_id, mode, name)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS history (
+    session_id TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (session_id, mode, seq)
+) WITHOUT ROWID;
+"""
+
+
+def shared_secret_key(db_path: str) -> bytes:
+    """A session signing key shared by every worker using `db_path`.
+
+    Created on first use as `<db_path>.secret` (mode 0600); the first worker
+    to link its candidate into place wins and the others read that one.
+    """
+    path = db_path + ".secret"
+    if not os.path.exists(path):
+        tmp = f"{path}.{os.getpid()}.tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        try:
+            os.write(fd, os.urandom(32))
+        finally:
+            os.close(fd)
+        try:
+            os.link(tmp, path)
+        except FileExistsError:
+            pass
+        finally:
+            os.unlink(tmp)
+    with open(path, "rb") as f:
+        return f.read()
+
+
+class Stored(NamedTuple):
+    """What the database holds for one mode, as last loaded or saved."""
+    state: dict
+    version: int
+    rev: int
+    crew: dict           # name -> JSON text of the member row
+    history_total: int
+
+
+class ConnectionPool:
+    def __init__(self, path: str, size: int = POOL_SIZE):
+        self.path = path
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode; transactions are opened explicitly with BEGIN
+        conn = sqlite3.connect(
+            self.path, timeout=BUSY_TIMEOUT, isolation_level=None, check_same_thread=False
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        return conn
+
+    @contextmanager
+    def connection(self):
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                grow = self._created < self.size
+                if grow:
+                    self._created += 1
+            conn = self._connect() if grow else self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+
+class SqliteSessionStore(SessionStore):
+    """SessionStore persisted to SQLite; `on_load(state)` runs for every loaded state."""
+
+    def __init__(self, path: str, base: dict, on_load=None, pool_size: int = POOL_SIZE, **kwargs):
+        super().__init__(base, **kwargs)
+        self.on_load = on_load
+        # Nothing touches the database until the first request needs a session
+        self.pool = ConnectionPool(path, pool_size)
+
+    # -----------------------------
+    # LOADING
+    # -----------------------------
+    def refresh(self, game) -> list[str]:
+        sid = game.session_id
+        reloaded = []
+        with self.pool.connection() as conn:
+            conn.execute("BEGIN")  # one read snapshot for every mode
+            try:
+                revs = dict(conn.execute("SELECT mode, rev FROM states WHERE session_id = ?", (sid,)))
+                for mode, rev in revs.items():
+                    stored = game.stored.get(mode)
+                    if stored is None or stored.rev != rev:
+                        game.stored[mode] = self._load(conn, sid, mode)
+                        game.states[mode] = game.stored[mode].state
+                        reloaded.append(mode)
+            finally:
+                conn.execute("COMMIT")
+        return reloaded
+
+    def reload(self, game) -> list[str]:
+        game.states = {mode: fork_state(self.base) for mode in game.states}
+        game.stored.clear()
+        return self.refresh(game)
+
+    def _load(self, conn, sid: str, mode: str) -> Stored:
+        key = (sid, mode)
+        rev, day, credits, heat, history_total, stats, result, config = conn.execute(
+            "SELECT rev, day, credits, global_heat, history_total, stats, "
+            "last_mission_result, last_mission_config FROM states WHERE session_id = ? AND mode = ?",
+            key,
+        ).fetchone()
+        integrity, repair_days, upgrades = conn.execute(
+            "SELECT integrity, repair_days, upgrades FROM war_machine WHERE session_id = ? AND mode = ?",
+            key,
+        ).fetchone()
+        crew_rows = conn.execute(
+            "SELECT name, data FROM crew WHERE session_id = ? AND mode = ? ORDER BY position", key
+        ).fetchall()
+        history_rows = conn.execute(
+            "SELECT seq, data FROM history WHERE session_id = ? AND mode = ? ORDER BY seq", key
+        ).fetchall()
+
+        base_history = self.base["mission_history"]
+        state = CowState.owning({
+            "version": 0,
+            "day": day,
+            "credits": credits,
+            "global_heat": heat,
+            "war_machine": WarMachine(integrity, repair_days, json.loads(upgrades)),
+            "crew": Roster(
+                (json.loads(data) for _, data in crew_rows),
+                specialty_bits=self.base["crew"].specialty_bits,
+            ),
+            "mission_history": MissionHistory.from_records(
+                (json.loads(data) for _, data in history_rows),
+                base_history.fields,
+                base_history.retention,
+                first_seq=history_rows[0][0] if history_rows else history_total,
+            ),
+            "stats": CampaignStats.from_dict(json.loads(stats)),
+            "last_mission_result": _mission_record(json.loads(result)),
+            "last_mission_config": json.loads(config),
+        })
+        if self.on_load is not None:
+            self.on_load(state)
+        return Stored(state, state["version"], rev, dict(crew_rows), history_total)
+
+    # -----------------------------
+    # SAVING
+    # -----------------------------
+    def save(self, game) -> None:
+        changed = [mode for mode, state in game.states.items() if self._changed(game, mode, state)]
+        if not changed:
+            return
+        saved = {}
+        with self.pool.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for mode in changed:
+                    saved[mode] = self._write(conn, game.session_id, mode, game.states[mode],
+                                              game.stored.get(mode))
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        game.stored.update(saved)
+
+    @staticmethod
+    def _changed(game, mode: str, state: dict) -> bool:
+        stored = game.stored.get(mode)
+        if stored is None:
+            return state["version"] != 0  # untouched fork of the base state
+        return state is not stored.state or state["version"] != stored.version
+
+    def _write(self, conn, sid: str, mode: str, state: dict, stored) -> Stored:
+        key = (sid, mode)
+        history = state["mission_history"]
+        scalars = (
+            state["day"],
+            state["credits"],
+            state["global_heat"],
+            history.total,
+            json.dumps(state["stats"].to_dict()),
+            json.dumps(_plain(state["last_mission_result"])),
+            json.dumps(state["last_mission_config"]),
+        )
+        if stored is None:
+            rev = 1
+            cursor = conn.execute(
+                "INSERT INTO states (session_id, mode, rev, day, credits, global_heat, history_total, "
+                "stats, last_mission_result, last_mission_config) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (session_id, mode) DO NOTHING",
+                key + (rev,) + scalars,
+            )
+        else:
+            rev = stored.rev + 1
+            cursor = conn.execute(
+                "UPDATE states SET rev = ?, day = ?, credits = ?, global_heat = ?, history_total = ?, "
+                "stats = ?, last_mission_result = ?, last_mission_config = ? "
+                "WHERE session_id = ? AND mode = ? AND rev = ?",
+                (rev,) + scalars + key + (stored.rev,),
+            )
+        if cursor.rowcount != 1:
+            raise StateConflict(f"{sid}/{mode} was saved by another worker")
+
+        # A different state object (new session, sandbox fork) is rewritten
+        # from scratch; otherwise only changed crew rows and new history rows
+        full = stored is None or state is not stored.state
+        if full:
+            for table in ("crew", "history"):
+                conn.execute(f"DELETE FROM {table} WHERE session_id = ? AND mode = ?", key)
+
+        wm = state["war_machine"]
+        conn.execute(
+            "INSERT OR REPLACE INTO war_machine (session_id, mode, integrity, repair_days, upgrades) "
+            "VALUES (?, ?, ?, ?, ?)",
+            key + (wm["integrity"], wm["repair_days"], json.dumps(wm["upgrades"])),
+        )
+
+        crew = {}
+        updates = []
+        for position, member in enumerate(state["crew"]):
+            data = json.dumps(member.to_dict(), sort_keys=True)
+            crew[member["name"]] = data
+            if full or stored.crew.get(member["name"]) != data:
+                updates.append(key + (member["name"], position, data))
+        conn.executemany(
+            "INSERT OR REPLACE INTO crew (session_id, mode, name, position, data) VALUES (?, ?, ?, ?, ?)",
+            updates,
+        )
+
+        since = 0 if full else stored.history_total
+        new_rows = history.page(limit=min(history.total - since, len(history)))["records"]
+        conn.executemany(
+            "INSERT OR REPLACE INTO history (session_id, mode, seq, data) VALUES (?, ?, ?, ?)",
+            (key + (r.pop("seq"), json.dumps(r)) for r in reversed(new_rows)),
+        )
+        conn.execute(
+            "DELETE FROM history WHERE session_id = ? AND mode = ? AND seq < ?",
+            key + (history.total - history.retention,),
+        )
+        return Stored(state, state["version"], rev, crew, history.total)
+
+
+def _plain(record):
+    return record.to_dict() if record is not None else None
+
+
+def _mission_record(data):
+    return MissionRecord.from_dict(data) if data is not None else None
@@ -0,0 +1,55 @@
+# startup.py
+#
+# Cold-start helpers shared by app.py and web_server.py: a phase timer for the
+# startup report, and an on-disk Jinja bytecode cache so a fresh worker loads
+# compiled templates instead of parsing and compiling every one again.
+
+import os
+import time
+
+
+class StartupTimer:
+    """Wall-clock time spent in each named startup phase, in order."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._last = self.started
+        self.phases = {}
+
+    def mark(self, phase: str) -> None:
+        now = time.perf_counter()
+        self.phases[phase] = round((now - self._last) * 1000, 1)
+        self._last = now
+
+    def report(self) -> dict:
+        return {
+            "phases_ms": dict(self.phases),
+            "total_ms": round(sum(self.phases.values()), 1),
+        }
+
+
+def enable_bytecode_cache(app, cache_dir=None) -> str:
+    """Persist compiled templates under `cache_dir` (GENESIS_JINJA_CACHE by default).
+
+    Without either, Jinja's own per-user cache directory is used; it is
+    created private (0700) and refused if another user owns it, since the
+    cache holds code that gets executed.
+    """
+    from jinja2 import FileSystemBytecodeCache
+
+    cache_dir = cache_dir or os.environ.get("GENESIS_JINJA_CACHE")
+    if cache_dir:
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        cache = FileSystemBytecodeCache(cache_dir)
+    else:
+        cache = FileSystemBytecodeCache()
+    app.jinja_env.bytecode_cache = cache
+    return cache.directory
+
+
+def precompile_templates(app) -> int:
+    """Load every HTML template once, so its bytecode lands in the cache."""
+    names = app.jinja_env.list_templates(extensions=("html",))
+    for name in names:
+        app.jinja_env.get_template(name)
+    return len(names)
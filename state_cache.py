@@ -0,0 +1,66 @@
+# state_cache.py
+#
+# Bounded LRU cache for values derived from a game state. Every key starts
+# with the state version it was computed from; when a state is mutated its old
+# version is dropped explicitly, so entries never outlive the state they
+# describe and nothing needs a TTL.
+
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAXSIZE = 1024
+
+
+class StateCache:
+    def __init__(self, name: str, maxsize: int = DEFAULT_MAXSIZE):
+        self.name = name
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._by_version = {}
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, version: int, key, compute):
+        full_key = (version, key)
+        with self._lock:
+            if full_key in self._entries:
+                self._entries.move_to_end(full_key)
+                self.hits += 1
+                return self._entries[full_key]
+            self.misses += 1
+        # Compute outside the lock; the caller already holds its session lock
+        value = compute()
+        with self._lock:
+            self._entries[full_key] = value
+            self._by_version.setdefault(version, set()).add(full_key)
+            while len(self._entries) > self.maxsize:
+                old_key, _ = self._entries.popitem(last=False)
+                self._forget(old_key)
+        return value
+
+    def invalidate_version(self, version: int) -> None:
+        with self._lock:
+            for full_key in self._by_version.pop(version, ()):
+                self._entries.pop(full_key, None)
+                self.invalidations += 1
+
+    def _forget(self, full_key) -> None:
+        keys = self._by_version.get(full_key[0])
+        if keys is not None:
+            keys.discard(full_key)
+            if not keys:
+                del self._by_version[full_key[0]]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
@@ -0,0 +1,185 @@
+# state_model.py
+#
+# Typed records for the web app's game state: crew members, the war machine
+# and mission results are __slots__ objects instead of free-form dicts.
+#
+# A crew member only holds what changes during a campaign (injury and
+# recovery days) plus a reference to an immutable CrewProfile with the static
+# fields (specialty, backstory, relations, ...). Profiles are interned, so
+# every session, fork and reload of the same member shares one, and copying a
+# roster copies two small fields per member. Every record is also a read-only
+# Mapping over its fields (`member["name"]`, `.get()`, `dict(member)`), which
+# is what the rule functions, the templates and the JSON encoders rely on;
+# fields that may change are assignable as items too.
+
+import operator
+import weakref
+from collections.abc import Mapping
+
+
+class Record(Mapping):
+    """Mapping view over `FIELDS`; items in `MUTABLE` can also be assigned."""
+
+    __slots__ = ()
+    FIELDS = ()
+    MUTABLE = frozenset()
+
+    def __getitem__(self, key):
+        return self._getters[key](self)
+
+    def get(self, key, default=None):
+        getter = self._getters.get(key)
+        return default if getter is None else getter(self)
+
+    def __setitem__(self, key, value):
+        if key not in self.MUTABLE:
+            raise KeyError(f"{key!r} is not a mutable {type(self).__name__} field")
+        setattr(self, key, value)
+
+    def __iter__(self):
+        return iter(self.FIELDS)
+
+    def __len__(self) -> int:
+        return len(self.FIELDS)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def to_dict(self) -> dict:
+        return {k: getattr(self, k) for k in self.FIELDS}
+
+    def copy(self):
+        """Shallow copy, like dict.copy(); shared parts stay shared."""
+        return self.__copy__()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._getters = {k: operator.attrgetter(k) for k in cls.FIELDS}
+
+
+# -----------------------------
+# CREW
+# -----------------------------
+class CrewProfile(Record):
+    """Static part of a crew member, shared by every copy of that member."""
+
+    __slots__ = ("name", "heat_mod", "specialty", "backstory", "relations", "status",
+                 "known_shadow", "__weakref__")
+    FIELDS = ("name", "heat_mod", "specialty", "backstory", "relations", "status", "known_shadow")
+
+    _interned = weakref.WeakValueDictionary()
+
+    def __init__(self, name: str, heat_mod: int = 0, specialty: str = "", backstory: str = "",
+                 relations=(), status: str = "Active", known_shadow=()):
+        self.name = name
+        self.heat_mod = heat_mod
+        self.specialty = specialty
+        self.backstory = backstory
+        self.relations = tuple(relations)
+        self.status = status
+        self.known_shadow = tuple(known_shadow)
+
+    @classmethod
+    def intern(cls, data: Mapping) -> "CrewProfile":
+        """The shared profile for the static fields in `data`."""
+        profile = cls(**{k: data[k] for k in cls.FIELDS if k in data})
+        key = tuple(getattr(profile, k) for k in cls.FIELDS)
+        return cls._interned.setdefault(key, profile)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class CrewMember(Record):
+    __slots__ = ("profile", "injury", "injury_days")
+    FIELDS = ("name", "injury", "injury_days", "heat_mod", "specialty", "backstory",
+              "relations", "status", "known_shadow")
+    MUTABLE = frozenset({"injury", "injury_days"})
+
+    def __init__(self, profile: CrewProfile, injury=None, injury_days: int = 0):
+        self.profile = profile
+        self.injury = injury
+        self.injury_days = injury_days
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> "CrewMember":
+        if isinstance(data, cls):
+            return data
+        return cls(CrewProfile.intern(data), data.get("injury"), data.get("injury_days", 0))
+
+    def __copy__(self):
+        return CrewMember(self.profile, self.injury, self.injury_days)
+
+    def __deepcopy__(self, memo):
+        return CrewMember(self.profile, self.injury, self.injury_days)
+
+
+# Static fields read through to the shared profile
+for _name in CrewProfile.FIELDS:
+    setattr(CrewMember, _name, property(operator.attrgetter(f"profile.{_name}")))
+    CrewMember._getters[_name] = operator.attrgetter(f"profile.{_name}")
+del _name
+
+
+# -----------------------------
+# WAR MACHINE
+# -----------------------------
+class WarMachine(Record):
+    __slots__ = ("integrity", "repair_days", "upgrades")
+    FIELDS = ("integrity", "repair_days", "upgrades")
+    MUTABLE = frozenset(FIELDS)
+
+    def __init__(self, integrity: int = 100, repair_days: int = 0, upgrades=None):
+        self.integrity = integrity
+        self.repair_days = repair_days
+        self.upgrades = upgrades if upgrades is not None else {}
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> "WarMachine":
+        return cls(data["integrity"], data.get("repair_days", 0), dict(data.get("upgrades", {})))
+
+    def __copy__(self):
+        return WarMachine(self.integrity, self.repair_days, self.upgrades)
+
+    def __deepcopy__(self, memo):
+        return WarMachine(self.integrity, self.repair_days, dict(self.upgrades))
+
+
+# -----------------------------
+# MISSIONS
+# -----------------------------
+class MissionRecord(Record):
+    """One resolved mission, as written by app.resolve_mission; immutable."""
+
+    __slots__ = ("day", "outcome", "heat_after", "wm_integrity_after", "injuries", "mission_type",
+                 "mission_label", "crew", "projected_success", "projected_heat_change",
+                 "projected_wm_change")
+    FIELDS = __slots__
+
+    def __init__(self, day: int, outcome: str, heat_after: int, wm_integrity_after: int, injuries,
+                 mission_type: str, mission_label: str, crew, projected_success: int,
+                 projected_heat_change: int, projected_wm_change: int):
+        self.day = day
+        self.outcome = outcome
+        self.heat_after = heat_after
+        self.wm_integrity_after = wm_integrity_after
+        self.injuries = tuple(injuries)
+        self.mission_type = mission_type
+        self.mission_label = mission_label
+        self.crew = tuple(crew)
+        self.projected_success = projected_success
+        self.projected_heat_change = projected_heat_change
+        self.projected_wm_change = projected_wm_change
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> "MissionRecord":
+        return cls(**{k: data[k] for k in cls.FIELDS})
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
@@ -0,0 +1,51 @@
+# test_advance_days.py
+#
+# app.advance_days(state, n) against n single advance_day steps.
+
+import copy
+import random
+
+import pytest
+
+import app
+from game_session import fork_state
+
+
+def random_state(rng: random.Random) -> dict:
+    state = fork_state(app.BASE_GAME_STATE)
+    state["day"] = rng.randint(1, 500)
+    state["global_heat"] = rng.randint(0, 200)
+    war_machine = app.writable(state, "war_machine")
+    war_machine["integrity"] = rng.randint(0, 100)
+    war_machine["repair_days"] = rng.choice([0, 0, rng.randint(1, 12)])
+    roster = app.writable(state, "crew")
+    for member in list(roster):
+        if rng.random() < 0.5:
+            roster.injure(member["name"])
+            member["injury_days"] = rng.randint(0, app.RECOVERY_DAYS - 1)
+    return state
+
+
+def snapshot(state: dict) -> dict:
+    return {
+        "day": state["day"],
+        "global_heat": state["global_heat"],
+        "war_machine": dict(state["war_machine"]),
+        "crew": [(c["name"], c["injury"], c["injury_days"]) for c in state["crew"]],
+        "injured": sorted(state["crew"].injured),
+        "stats": copy.deepcopy(state["stats"].to_dict()),
+    }
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_matches_single_days(seed):
+    rng = random.Random(seed)
+    state = random_state(rng)
+    stepped = copy.deepcopy(state)
+    days = rng.randint(1, 60)
+
+    app.advance_days(state, days)
+    for _ in range(days):
+        app.advance_day(stepped)
+
+    assert snapshot(state) == snapshot(stepped)
@@ -0,0 +1,56 @@
+# test_crew_search.py
+#
+# suggest_crew's branch-and-bound against a brute-force search.
+
+import itertools
+import random
+
+import pytest
+
+from crew_search import suggest_crew
+
+
+def brute_force(crew, mission, is_specialist, success_pct, top_k, heat_weight):
+    ready = [c for c in crew if c["injury"] is None]
+    scores = []
+    for size in range(1, mission["max_crew"] + 1):
+        for picked in itertools.combinations(ready, size):
+            success = success_pct[1] if any(is_specialist(c) for c in picked) else success_pct[0]
+            heat = mission["base_heat"] + sum(c["heat_mod"] for c in picked)
+            scores.append(round(success - heat_weight * heat, 2))
+    return sorted(scores, reverse=True)[:top_k]
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_matches_brute_force(seed):
+    rng = random.Random(seed)
+    crew = [
+        {
+            "name": f"m{i}",
+            "heat_mod": rng.randint(-3, 4),
+            "specialty": rng.choice(["tech", "physical", "shadow"]),
+            "injury": "Sprain" if rng.random() < 0.2 else None,
+        }
+        for i in range(rng.randint(0, 9))
+    ]
+    mission = {"max_crew": rng.randint(1, 4), "base_heat": rng.randint(0, 10)}
+    success_pct = (rng.randint(10, 60), rng.randint(60, 95))
+    top_k = rng.randint(1, 6)
+    heat_weight = rng.choice([0.5, 1.0, 2.0])
+
+    def is_specialist(c):
+        return c["specialty"] == "tech"
+
+    results = suggest_crew(crew, mission, is_specialist, success_pct, top_k, heat_weight)
+    expected = brute_force(crew, mission, is_specialist, success_pct, top_k, heat_weight)
+    assert [r["score"] for r in results] == expected
+
+    by_name = {c["name"]: c for c in crew}
+    for r in results:
+        picked = [by_name[name] for name in r["crew"]]
+        assert len(set(r["crew"])) == len(picked) <= mission["max_crew"]
+        assert all(c["injury"] is None for c in picked)
+        success = success_pct[1] if any(is_specialist(c) for c in picked) else success_pct[0]
+        assert r["projected_success"] == success
+        heat = mission["base_heat"] + sum(c["heat_mod"] for c in picked)
+        assert r["projected_heat_change"] == heat
@@ -0,0 +1,47 @@
+# test_mission_history.py
+#
+# Regression tests for MissionHistory.query.
+
+import pytest
+
+from mission_history import MissionHistory
+
+
+def make_history() -> MissionHistory:
+    history = MissionHistory(retention=100)
+    for day in range(1, 41):
+        history.append({
+            "day": day,
+            "outcome": "Success" if day % 2 else "Failure",
+            "heat_after": day,
+            "wm_integrity_after": 100,
+            "injuries": ["Vega"] if day % 3 == 0 else [],
+            "mission_type": "tech",
+            "mission_label": "Tech Op",
+            "crew": ["Vega", "Iris"],
+            "projected_success": 60,
+            "projected_heat_change": 5,
+            "projected_wm_change": -5,
+        })
+    return history
+
+
+@pytest.mark.parametrize("newest_first", [True, False])
+@pytest.mark.parametrize("filters", [
+    {"equals": {"crew": "Iris", "outcome": "Success"}},
+    {"equals": {"crew": "Vega"}, "nonempty": {"injuries": True}},
+])
+def test_inverted_day_range_is_empty(filters, newest_first):
+    page = make_history().query(day_min=30, day_max=5, newest_first=newest_first, **filters)
+    assert page == {"records": [], "next_cursor": None}
+
+
+@pytest.mark.parametrize("newest_first", [True, False])
+def test_day_range_with_several_posting_lists(newest_first):
+    page = make_history().query(
+        {"crew": "Vega", "outcome": "Failure"}, {"injuries": True},
+        day_min=5, day_max=30, newest_first=newest_first,
+    )
+    days = [record["day"] for record in page["records"]]
+    expected = [6, 12, 18, 24, 30]
+    assert days == (expected[::-1] if newest_first else expected)
@@ -1,32 +1,97 @@
-from flask import Flask, render_template, redirect, url_for
-from project_genesis import GameEngine
+import atexit
+import threading
+import time
+
+from flask import Flask, render_template, redirect, url_for, request, jsonify
+from project_genesis import CommandError, GameEngine, parse_command
+from save_export import ExportError
+from startup import enable_bytecode_cache
 
 app = Flask(__name__)
-engine = GameEngine()
-engine.load_game()
+
+# The save is loaded (snapshot + journal replay) on first use rather than at
+# import, so a worker starts serving without waiting on it
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> GameEngine:
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                engine = GameEngine()
+                engine.load_game()
+                # Records since the last batched fsync must reach disk on exit
+                atexit.register(engine.close)
+                _engine = engine
+    return _engine
 
 @app.route("/")
 def index():
-    state = engine.state
+    engine = get_engine()
     return render_template(
         "index.html",
-        state=state,
+        state=engine.state,
         actions=engine.get_actions()
     )
 
 @app.route("/action/<int:choice>")
 def take_action(choice):
+    engine = get_engine()
     try:
-        engine.execute(choice)
-        engine.save_game()
+        engine.execute(choice)  # saves
     except Exception as e:
         print("Action error:", e)
     return redirect(url_for("index"))
 
+@app.route("/actions", methods=["POST"])
+def take_actions():
+    # Scripted turn: {"commands": [{"op": "resolve_mission", "crew_ids": [...]}, ...]}
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict) or not isinstance(payload.get("commands", []), list):
+        return jsonify({"error": "expected a JSON object with a 'commands' list"}), 400
+    engine = get_engine()
+    try:
+        commands = [parse_command(c) for c in payload.get("commands", [])]
+        state = engine.execute_batch(commands)
+    except CommandError as e:
+        return jsonify({"error": str(e)}), 400
+    # Only what the batch touched; the full history is served by /export
+    return jsonify({"applied": len(commands), "state": state})
+
 @app.route("/export")
 def export():
+    # Streamed: header, crew and history are gzipped chunk by chunk as the
+    # client reads, never materialized as one document
+    filename = time.strftime("genesis-%Y%m%d-%H%M%S.ndjson.gz")
+    return app.response_class(
+        get_engine().export_stream(),
+        mimetype="application/gzip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+@app.route("/export/save", methods=["POST"])
+def export_to_disk():
+    engine = get_engine()
     filename = engine.export_save(engine.state)
     return f"Exported save to {filename}"
 
+@app.route("/import", methods=["POST"])
+def import_save():
+    # Accepts a multipart upload field "save" or the raw export as the body
+    upload = request.files.get("save")
+    try:
+        get_engine().import_save(upload.stream if upload else request.stream)
+    except ExportError as e:
+        return jsonify({"error": str(e)}), 400
+    return redirect(url_for("index"))
+
+def create_app() -> Flask:
+    """The app with its template bytecode cache enabled; for servers."""
+    enable_bytecode_cache(app)
+    return app
+
+
 if __name__ == "__main__":
-    app.run(debug=True)
+    create_app().run(debug=True)